@@ -0,0 +1,12 @@
+"""
+Benchmarks for django-superform.
+
+They measure the construction, validation, media, rendering and saving of
+super forms with varying nesting depth, number of composite fields and
+formset sizes, and compare them with the same forms combined by hand. Run
+them with::
+
+    python -m benchmarks
+
+See ``python -m benchmarks --help`` for the available options.
+"""
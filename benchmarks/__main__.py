@@ -0,0 +1,94 @@
+from __future__ import print_function
+
+import argparse
+import itertools
+import os
+import sys
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark django-superform."
+    )
+    parser.add_argument("--depth", type=int, nargs="+", default=[1, 3])
+    parser.add_argument("--fields", type=int, nargs="+", default=[2, 5])
+    parser.add_argument("--formset-size", type=int, nargs="+", default=[10, 100])
+    parser.add_argument(
+        "--kind", choices=["plain", "model"], nargs="+", default=["plain", "model"]
+    )
+    parser.add_argument("--phase", nargs="+", default=None)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--save-baseline", metavar="PATH", help="Write the results to PATH."
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="PATH",
+        help="Compare the results with the baseline stored in PATH.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Report a regression if a benchmark is slower than THRESHOLD "
+        "times the baseline (default: 1.25).",
+    )
+    return parser.parse_args(argv)
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    import django
+    from django.db import connection
+
+    if hasattr(django, "setup"):
+        django.setup()
+    connection.creation.create_test_db(verbosity=0)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    setup_django()
+
+    from .runner import (
+        PHASES,
+        compare_to_baseline,
+        format_results,
+        load_baseline,
+        run_scenario,
+        save_baseline,
+    )
+    from .scenarios import Scenario
+
+    phases = args.phase or PHASES
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    results = {}
+    for kind, depth, fields, formset_size in itertools.product(
+        args.kind, args.depth, args.fields, args.formset_size
+    ):
+        scenario = Scenario(
+            depth=depth,
+            fields=fields,
+            formset_size=formset_size,
+            model=kind == "model",
+        )
+        results.update(run_scenario(scenario, phases=phases, repeat=args.repeat))
+
+    print(format_results(results, baseline))
+
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+
+    if baseline is not None:
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print()
+            for key, ratio in regressions:
+                print("Regression: {0} ({1:.2f}x baseline)".format(key, ratio))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
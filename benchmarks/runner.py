@@ -0,0 +1,202 @@
+"""
+Measures the phases of a scenario for the super form and for the equivalent
+hand written forms. Every measurement reports the time, the memory allocated
+during the run and the number of database queries.
+"""
+import gc
+import json
+import time
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2 has no tracemalloc, memory is not reported there.
+    tracemalloc = None
+
+try:
+    timer = time.perf_counter
+except AttributeError:
+    timer = time.time
+
+
+PHASES = ("init", "clean", "media", "render", "save")
+
+
+def render_superform(form):
+    """
+    Render the super form's own fields and all composite fields through
+    their widgets. Nested super forms are rendered recursively.
+    """
+    parts = [str(form)]
+    for name in form.composite_fields:
+        parts.append(str(form[name]))
+        value = form.get_composite_field_value(name)
+        if hasattr(value, "composite_fields"):
+            parts.append(render_superform(value))
+    return "".join(parts)
+
+
+class Rollback(Exception):
+    pass
+
+
+def run_rolled_back(func):
+    """
+    Run ``func`` in a transaction that is rolled back afterwards, so that
+    saves can be measured repeatedly.
+    """
+    try:
+        with transaction.atomic():
+            func()
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def get_phase_function(scenario, phase, implementation):
+    """
+    Return a tuple of ``(setup, run)``. ``setup()`` is not measured, its
+    return value is passed to ``run()``.
+    """
+    data = scenario.get_data()
+    if implementation == "superform":
+        build = scenario.build_superform
+        render = render_superform
+    else:
+        build = scenario.build_manual
+
+        def render(forms):
+            return forms.render()
+
+    def build_valid():
+        forms = build(data)
+        forms.is_valid()
+        return forms
+
+    if phase == "init":
+        return (lambda: None), (lambda _: build(data))
+    if phase == "clean":
+        return (lambda: build(data)), (lambda forms: forms.is_valid())
+    if phase == "media":
+        return (lambda: build(data)), (lambda forms: forms.media)
+    if phase == "render":
+        return (lambda: build(data)), render
+    if phase == "save":
+        return build_valid, (lambda forms: run_rolled_back(forms.save))
+    raise ValueError("Unknown phase {0!r}".format(phase))
+
+
+def measure(setup, run, repeat):
+    """
+    Run ``run(setup())`` ``repeat`` times and return a dict with the
+    fastest and the median time in milliseconds, the memory allocated by
+    one run and the number of queries of one run.
+    """
+    times = []
+    for _ in range(repeat):
+        argument = setup()
+        gc.collect()
+        start = timer()
+        run(argument)
+        times.append((timer() - start) * 1000)
+    times.sort()
+
+    argument = setup()
+    gc.collect()
+    with CaptureQueriesContext(connection) as queries:
+        if tracemalloc is not None:
+            tracemalloc.start()
+            run(argument)
+            allocated, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        else:
+            run(argument)
+            allocated = peak = None
+
+    return {
+        "min_ms": times[0],
+        "median_ms": times[len(times) // 2],
+        "allocated_kb": allocated / 1024.0 if allocated is not None else None,
+        "peak_kb": peak / 1024.0 if peak is not None else None,
+        "queries": len(queries),
+    }
+
+
+def run_scenario(scenario, phases=PHASES, repeat=10):
+    """
+    Measure all ``phases`` of ``scenario`` for the super form and the hand
+    written forms. Returns a dict that maps ``"<scenario>/<phase>"`` to the
+    results of both implementations.
+    """
+    results = {}
+    for phase in phases:
+        if phase == "save" and not scenario.model:
+            continue
+        key = "{0}/{1}".format(scenario.name, phase)
+        results[key] = {}
+        for implementation in ("superform", "manual"):
+            setup, run = get_phase_function(scenario, phase, implementation)
+            results[key][implementation] = measure(setup, run, repeat)
+    return results
+
+
+def format_results(results, baseline=None):
+    lines = [
+        "{0:<40} {1:>11} {2:>11} {3:>9} {4:>11} {5:>8} {6:>10}".format(
+            "benchmark", "super [ms]", "manual [ms]", "overhead",
+            "alloc [kb]", "queries", "baseline"
+        )
+    ]
+    for key in sorted(results):
+        superform = results[key]["superform"]
+        manual = results[key]["manual"]
+        overhead = superform["min_ms"] / manual["min_ms"] if manual["min_ms"] else 0
+        change = ""
+        if baseline and key in baseline:
+            change = "{0:+.0%}".format(
+                superform["min_ms"] / baseline[key]["superform"]["min_ms"] - 1
+            )
+        allocated = superform["allocated_kb"]
+        lines.append(
+            "{0:<40} {1:>11.2f} {2:>11.2f} {3:>8.2f}x {4:>11} {5:>8} {6:>10}".format(
+                key,
+                superform["min_ms"],
+                manual["min_ms"],
+                overhead,
+                "-" if allocated is None else "{0:.1f}".format(allocated),
+                superform["queries"],
+                change,
+            )
+        )
+    return "\n".join(lines)
+
+
+def save_baseline(results, path):
+    with open(path, "w") as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """
+    Return a list of ``(key, ratio)`` tuples for every benchmark in which
+    the super form got slower than ``threshold`` times the baseline or needs
+    more queries than before.
+    """
+    regressions = []
+    for key, result in sorted(results.items()):
+        if key not in baseline:
+            continue
+        current = result["superform"]
+        previous = baseline[key]["superform"]
+        ratio = current["min_ms"] / previous["min_ms"] if previous["min_ms"] else 0
+        if ratio > threshold or current["queries"] > previous["queries"]:
+            regressions.append((key, ratio))
+    return regressions
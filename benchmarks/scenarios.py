@@ -0,0 +1,198 @@
+"""
+Builds the super forms that are benchmarked, the equivalent hand written
+combination of plain Django forms and the POST data for both.
+
+A scenario is described by:
+
+``depth``
+    The number of nested super form levels. The innermost level contains
+    plain forms.
+``fields``
+    The number of ``FormField`` composites on every level.
+``formset_size``
+    The number of rows in the ``FormSetField`` that every level has.
+``model``
+    Use model forms, ``ModelFormField`` and ``InlineFormSetField`` if
+    ``True``. Plain forms and ``FormSetField`` otherwise.
+"""
+from django import forms
+from django.forms.formsets import formset_factory
+from django.forms.models import inlineformset_factory
+
+from django_superform import (
+    FormField,
+    FormSetField,
+    InlineFormSetField,
+    ModelFormField,
+    SuperForm,
+    SuperModelForm,
+)
+
+from tests.models import Post, Series
+
+
+class LeafForm(forms.Form):
+    name = forms.CharField(max_length=50)
+
+
+class SeriesForm(forms.ModelForm):
+    class Meta:
+        model = Series
+        fields = ("title",)
+
+
+LeafFormSet = formset_factory(LeafForm, extra=0)
+PostInlineFormSet = inlineformset_factory(Series, Post, fields=("title",), extra=0)
+
+
+class Scenario(object):
+    def __init__(self, depth=2, fields=2, formset_size=10, model=False):
+        self.depth = depth
+        self.fields = fields
+        self.formset_size = formset_size
+        self.model = model
+        self.superform_class = self._build_superform_class(depth)
+
+    @property
+    def name(self):
+        return "{kind}-depth{depth}-fields{fields}-rows{rows}".format(
+            kind="model" if self.model else "plain",
+            depth=self.depth,
+            fields=self.fields,
+            rows=self.formset_size,
+        )
+
+    @property
+    def field_name(self):
+        return "title" if self.model else "name"
+
+    @property
+    def leaf_form_class(self):
+        return SeriesForm if self.model else LeafForm
+
+    def _build_superform_class(self, depth):
+        if depth > 1:
+            child_class = self._build_superform_class(depth - 1)
+        else:
+            child_class = self.leaf_form_class
+
+        attrs = {}
+        if self.model:
+
+            class Meta:
+                model = Series
+                fields = ("title",)
+
+            attrs["Meta"] = Meta
+            for i in range(self.fields):
+                attrs["child_%d" % i] = ModelFormField(child_class)
+            attrs["rows"] = InlineFormSetField(formset_class=PostInlineFormSet)
+            base = SuperModelForm
+        else:
+            attrs["name"] = forms.CharField(max_length=50)
+            for i in range(self.fields):
+                attrs["child_%d" % i] = FormField(child_class)
+            attrs["rows"] = FormSetField(LeafFormSet)
+            base = SuperForm
+        return type(str("Level%dForm" % depth), (base,), attrs)
+
+    def get_data(self):
+        data = {}
+        self._add_data(data, None, self.depth)
+        return data
+
+    def _add_data(self, data, prefix, depth):
+        def name(field_name):
+            return prefix + "-" + field_name if prefix else field_name
+
+        data[name(self.field_name)] = "Level %d" % depth
+        for i in range(self.fields):
+            child_prefix = name("form-child_%d" % i)
+            if depth > 1:
+                self._add_data(data, child_prefix, depth - 1)
+            else:
+                data[child_prefix + "-" + self.field_name] = "Leaf %d" % i
+        rows_prefix = name("formset-rows")
+        data[rows_prefix + "-TOTAL_FORMS"] = str(self.formset_size)
+        data[rows_prefix + "-INITIAL_FORMS"] = "0"
+        for row in range(self.formset_size):
+            key = "%s-%d-%s" % (rows_prefix, row, self.field_name)
+            data[key] = "Row %d" % row
+
+    def build_superform(self, data=None):
+        return self.superform_class(data)
+
+    def build_manual(self, data=None):
+        """
+        Build the same forms and formsets as the super form does, but by
+        hand. Returns a :class:`ManualForms` instance.
+        """
+        manual = ManualForms(self.model)
+        self._build_manual(manual, data, None, self.depth)
+        return manual
+
+    def _build_manual(self, manual, data, prefix, depth):
+        def name(field_name):
+            return prefix + "-" + field_name if prefix else field_name
+
+        level = manual.add_form(self.leaf_form_class(data, prefix=prefix))
+        for i in range(self.fields):
+            child_prefix = name("form-child_%d" % i)
+            if depth > 1:
+                self._build_manual(manual, data, child_prefix, depth - 1)
+            else:
+                manual.add_form(self.leaf_form_class(data, prefix=child_prefix))
+        rows_prefix = name("formset-rows")
+        if self.model:
+            formset = PostInlineFormSet(
+                data, prefix=rows_prefix, instance=level.instance
+            )
+        else:
+            formset = LeafFormSet(data, prefix=rows_prefix)
+        manual.add_formset(formset)
+
+
+class ManualForms(object):
+    """
+    A hand written combination of plain forms and formsets. It offers the
+    same operations as a super form: validation, media, rendering and saving.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.forms = []
+        self.formsets = []
+
+    def add_form(self, form):
+        self.forms.append(form)
+        return form
+
+    def add_formset(self, formset):
+        self.formsets.append(formset)
+        return formset
+
+    def is_valid(self):
+        valid = True
+        for composite in self.forms + self.formsets:
+            valid = composite.is_valid() and valid
+        return valid
+
+    @property
+    def media(self):
+        media = forms.Media()
+        for composite in self.forms + self.formsets:
+            media = media + composite.media
+        return media
+
+    def render(self):
+        parts = [str(form) for form in self.forms]
+        for formset in self.formsets:
+            parts.append(str(formset.management_form))
+            parts.extend(str(form) for form in formset)
+        return "".join(parts)
+
+    def save(self):
+        for form in self.forms:
+            form.save()
+        for formset in self.formsets:
+            formset.save()
@@ -1,5 +1,7 @@
 from django.forms.forms import BoundField
 
+from . import instrumentation
+
 
 class CompositeBoundField(BoundField):
     """
@@ -69,7 +71,32 @@ class CompositeBoundField(BoundField):
         # TODO: We could make this work and return the forms/formsets errors.
         return self.form.error_class()
 
-    # as_widget, no changes required
+    def as_widget(self, widget=None, attrs=None, only_initial=False):
+        """
+        Renders the nested form or formset with the field's widget. The
+        rendering is reported to the instrumentation collector.
+        """
+        with instrumentation.measure(self.form, self.name, "render", self.field):
+            return super(CompositeBoundField, self).as_widget(
+                widget=widget, attrs=attrs, only_initial=only_initial
+            )
+
+    def stream(self, attrs=None):
+        """
+        Like ``as_widget`` but yields the HTML in chunks with the widget's
+        ``stream`` method, e.g. one chunk per form of a formset.
+        """
+        widget = self.field.widget
+        attrs = attrs or {}
+        auto_id = self.auto_id
+        if auto_id and "id" not in attrs and "id" not in widget.attrs:
+            attrs["id"] = auto_id
+        return widget.stream(
+            self.html_name,
+            self.value(),
+            attrs=attrs,
+            renderer=getattr(self.form, "renderer", None),
+        )
 
     def as_text(self, attrs=None, **kwargs):
         """
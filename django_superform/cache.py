@@ -0,0 +1,92 @@
+"""
+Small caching helpers that are used to avoid repeating expensive work, like
+creating formset classes, for every instantiation of a super form.
+"""
+import threading
+
+try:
+    from collections import OrderedDict
+except ImportError:
+    from django.utils.datastructures import SortedDict as OrderedDict
+
+
+def make_key(*args):
+    """
+    Turn the given arguments into a hashable key. Lists, tuples, sets and
+    dicts are converted recursively into tuples and frozensets.
+
+    Raises ``TypeError`` if one of the values cannot be hashed.
+    """
+    return tuple(_freeze(arg) for arg in args)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+class LRUCache(object):
+    """
+    A thread-safe, size bounded cache that evicts the least recently used
+    entries first. It keeps track of hits and misses which can be inspected
+    with :meth:`stats`.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, key, factory):
+        """
+        Return the value stored for ``key``. If there is none, ``factory()``
+        is called and its return value is stored.
+        """
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data[key] = value
+                return value
+
+        # Build the value without holding the lock. Two threads might build
+        # the same value at the same time, but only the first one is kept.
+        value = factory()
+        with self._lock:
+            value = self._data.setdefault(key, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Return a dict with the ``hits``, ``misses``, current ``size`` and
+        ``maxsize`` of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._data)
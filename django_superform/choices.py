@@ -0,0 +1,171 @@
+"""
+Sharing the choices of model choice fields between the forms of a formset.
+
+Every form of a formset has its own copy of a ``ModelChoiceField`` and every
+copy queries the database when its choices are rendered and when a submitted
+value is validated. A :class:`ChoiceCache` evaluates each distinct queryset
+only once and lets all fields with that queryset use the result.
+"""
+import copy
+
+from django.forms.models import ModelChoiceField, ModelMultipleChoiceField
+from django.utils import six
+
+from .cache import make_key
+
+try:
+    from django.core.exceptions import EmptyResultSet
+except ImportError:
+    from django.db.models.sql.datastructures import EmptyResultSet
+
+
+class CachedChoices(object):
+    """
+    The evaluated objects of one queryset, together with the choices and the
+    lookup tables built from them for the fields using the queryset.
+    """
+
+    def __init__(self, queryset):
+        # Evaluate a clone, the queryset might be shared with the form class.
+        self.objects = list(queryset.all())
+        self._choices = {}
+        self._lookups = {}
+
+    def get_choices(self, field):
+        """
+        Return the choices of ``field``, as its ``ModelChoiceIterator`` would
+        produce them.
+        """
+        key = (type(field), field.empty_label, field.to_field_name)
+        try:
+            return self._choices[key]
+        except KeyError:
+            pass
+        iterator = field.choices
+        choices = []
+        if field.empty_label is not None:
+            choices.append(("", field.empty_label))
+        choices.extend(iterator.choice(obj) for obj in self.objects)
+        return self._choices.setdefault(key, choices)
+
+    def get_lookup(self, field):
+        """
+        Return a dict that maps the submitted values that ``field`` accepts
+        to the objects.
+        """
+        key = field.to_field_name
+        try:
+            return self._lookups[key]
+        except KeyError:
+            pass
+        lookup = dict(
+            (six.text_type(field.prepare_value(obj)), obj) for obj in self.objects
+        )
+        return self._lookups.setdefault(key, lookup)
+
+
+def _cached_to_python(field, value):
+    if value not in field.empty_values:
+        try:
+            obj = field._cached_choices_lookup[six.text_type(value)]
+        except (KeyError, TypeError):
+            pass
+        else:
+            # Every form gets its own object, as with the uncached lookup.
+            return copy.copy(obj)
+    return type(field).to_python(field, value)
+
+
+def _cached_check_values(field, value):
+    lookup = field._cached_choices_lookup
+    try:
+        found = all(six.text_type(item) in lookup for item in value)
+    except TypeError:
+        found = False
+    if found:
+        key = field.to_field_name or "pk"
+        return field.queryset.filter(**{"%s__in" % key: list(value)})
+    return type(field)._check_values(field, value)
+
+
+class ChoiceCache(object):
+    """
+    Evaluates the queryset of every ``ModelChoiceField`` and
+    ``ModelMultipleChoiceField`` it is applied to once per distinct query.
+    The fields then render the cached choices and validate submitted values
+    against the cached objects. Values that are not found in the cache are
+    validated with a query like before, so the results do not change.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get_queryset_key(self, queryset):
+        """
+        Return the key under which the result of ``queryset`` is stored or
+        ``None`` if it cannot be cached.
+        """
+        try:
+            sql, params = queryset.query.sql_with_params()
+            return make_key(queryset.model, queryset.db, sql, params)
+        except (EmptyResultSet, TypeError):
+            return None
+
+    def get_entry(self, queryset):
+        key = self.get_queryset_key(queryset)
+        if key is None:
+            return None
+        try:
+            return self._entries[key]
+        except KeyError:
+            return self._entries.setdefault(key, CachedChoices(queryset))
+
+    def apply_field(self, field):
+        if field.queryset is None or hasattr(field, "_choices"):
+            # Fields with explicitly set choices do not use the queryset.
+            return
+        entry = self.get_entry(field.queryset)
+        if entry is None:
+            return
+        field.choices = entry.get_choices(field)
+        field._cached_choices_lookup = entry.get_lookup(field)
+        if isinstance(field, ModelMultipleChoiceField):
+            if hasattr(field, "_check_values"):
+                field._check_values = six.create_bound_method(
+                    _cached_check_values, field
+                )
+        else:
+            field.to_python = six.create_bound_method(_cached_to_python, field)
+
+    def apply_form(self, form, exclude=()):
+        for name, field in form.fields.items():
+            if name not in exclude and isinstance(field, ModelChoiceField):
+                self.apply_field(field)
+
+    def apply_formset(self, formset):
+        """
+        Apply the cache to every form of ``formset`` when the form is
+        constructed, so the forms are still built on first use.
+        """
+        construct_form = formset._construct_form
+
+        def _construct_form(i, **kwargs):
+            form = construct_form(i, **kwargs)
+            self.apply_form(form, _get_formset_exclude(formset))
+            return form
+
+        formset._construct_form = _construct_form
+
+
+def _get_formset_exclude(formset):
+    # The hidden primary key field of model formsets and the parent's
+    # foreign key of inline formsets select from the whole table. The
+    # primary key field is only known after the first form was constructed.
+    exclude = set()
+    pk_field = getattr(formset, "_pk_field", None)
+    if pk_field is not None:
+        exclude.add(pk_field.name)
+    fk = getattr(formset, "fk", None)
+    if fk is not None:
+        exclude.add(fk.name)
+    return exclude
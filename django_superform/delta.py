@@ -0,0 +1,83 @@
+"""
+Delta submissions of model formsets.
+
+A regular model formset expects the client to post every existing object of
+the queryset. In a delta submission the client only posts the rows that
+changed: the existing objects that were edited or marked for deletion come
+first, identified by their primary key, followed by the new rows. The
+management form counts only the posted rows.
+
+:class:`DeltaSubmission` restricts the queryset of the formset to the posted
+primary keys, so only those objects are loaded, validated and saved. All
+other objects of the collection are left untouched.
+"""
+from django.core.exceptions import ValidationError
+
+
+class DeltaSubmission(object):
+    """
+    Installs the delta submission mode on the bound model formset
+    ``formset``. It has to be installed before the queryset of the formset
+    is evaluated.
+
+    Posted rows whose object is not part of the formset's queryset, because
+    it was deleted or belongs to another parent, make the formset invalid.
+    """
+
+    error_message = "Some of the submitted objects do not exist anymore."
+
+    def __init__(self, formset):
+        self.formset = formset
+
+    def install(self):
+        formset = self.formset
+        if not formset.is_bound:
+            return self
+        pks = self.get_pks()
+        if pks is None:
+            # Leave the invalid management form to Django.
+            return self
+        queryset = formset.queryset
+        if queryset is None:
+            queryset = formset.model._default_manager.all()
+        formset.queryset = queryset.filter(pk__in=pks)
+
+        clean = formset.clean
+
+        def delta_clean():
+            self.validate()
+            return clean()
+
+        formset.clean = delta_clean
+        return self
+
+    def get_pks(self):
+        """
+        Return the list of the primary keys posted for the existing objects
+        or ``None`` if the management form is invalid.
+        """
+        formset = self.formset
+        try:
+            initial_forms = formset.initial_form_count()
+        except ValidationError:
+            return None
+        pk_field = formset.model._meta.pk
+        pks = []
+        for i in range(initial_forms):
+            key = "%s-%s" % (formset.add_prefix(i), pk_field.name)
+            try:
+                pk = pk_field.to_python(formset.data.get(key))
+            except ValidationError:
+                continue
+            if pk is not None:
+                pks.append(pk)
+        return pks
+
+    def validate(self):
+        """
+        Raise a ``ValidationError`` if a posted existing row was not found in
+        the queryset.
+        """
+        for form in self.formset.initial_forms:
+            if form.instance._state.adding:
+                raise ValidationError(self.error_message, code="missing")
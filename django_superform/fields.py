@@ -1,8 +1,78 @@
+import copy
+
+from django.db import connections, router
 from django.forms.models import inlineformset_factory
 
+from . import instrumentation
 from .boundfield import CompositeBoundField
+from .cache import LRUCache, make_key
+from .choices import ChoiceCache
+from .delta import DeltaSubmission
+from .unique import BatchUniqueValidation
 from .widgets import FormWidget, FormSetWidget
 
+try:
+    from django.core.exceptions import FieldDoesNotExist
+except ImportError:
+    from django.db.models.fields import FieldDoesNotExist
+
+
+def get_form_class_media(form_class):
+    """
+    Return the media of ``form_class`` without instantiating it. The media is
+    taken from the widgets of the declared fields and the form's ``Media``
+    definition.
+    """
+    form = form_class.__new__(form_class)
+    form.fields = form_class.base_fields
+    return form.media
+
+
+def has_class_media(form_class):
+    """
+    Return ``True`` if the media of ``form_class`` can be determined with
+    :func:`get_form_class_media`. That is not the case if the form class or
+    one of its bases outside of Django and this package defines
+    ``__init__``, which might change the widgets of the form instance, or if
+    that is the case for a form nested in a super form class.
+    """
+    for klass in form_class.__mro__:
+        if klass is object or "__init__" not in vars(klass):
+            continue
+        if not klass.__module__.startswith(("django.", "django_superform.")):
+            return False
+    composite_fields = getattr(form_class, "base_composite_fields", None)
+    if composite_fields:
+        form = form_class.__new__(form_class)
+        for name, field in composite_fields.items():
+            if not field.has_class_media(form, name):
+                return False
+    return True
+
+
+def _copy_config(value, memo):
+    """
+    Copy the dicts, lists and sets in the configuration ``value``
+    recursively. Other values, like model instances and querysets, are
+    shared.
+    """
+    if id(value) in memo:
+        return memo[id(value)]
+    if isinstance(value, dict):
+        result = memo[id(value)] = type(value)()
+        for key, item in value.items():
+            result[key] = _copy_config(item, memo)
+    elif isinstance(value, list):
+        result = memo[id(value)] = []
+        result.extend(_copy_config(item, memo) for item in value)
+    elif isinstance(value, (set, tuple)):
+        result = memo[id(value)] = type(value)(
+            _copy_config(item, memo) for item in value
+        )
+    else:
+        result = value
+    return result
+
 
 class BaseCompositeField(object):
     """
@@ -68,18 +138,74 @@ class CompositeField(BaseCompositeField):
         # the template.
         self.widget.field = self
 
+    # The configuration dicts and lists that are copied for every form
+    # instance that modifies the field.
+    copied_attributes = ("default_kwargs",)
+
+    def __deepcopy__(self, memo):
+        # Only copy what is commonly modified per form instance. The form and
+        # formset classes are shared.
+        result = copy.copy(self)
+        memo[id(self)] = result
+        result.widget = copy.deepcopy(self.widget, memo)
+        result.widget.field = result
+        for attribute in self.copied_attributes:
+            value = getattr(self, attribute, None)
+            if value is not None:
+                setattr(result, attribute, _copy_config(value, memo))
+        return result
+
     def get_bound_field(self, form, field_name):
         return CompositeBoundField(form, self, field_name)
 
+    def has_class_media(self, form, name):
+        """
+        Return ``True`` if the media of this field is the same for every
+        instance of the super form, so that it can be cached per form class.
+        """
+        return True
+
+    def compile(self, form_class, name):
+        """
+        Called once by the super form's metaclass for every declared composite
+        field. Return a dict of values that can be computed without having a
+        form instance. They are stored in the form class'
+        ``composite_plan`` and can be retrieved with :meth:`get_compiled`.
+        """
+        return {
+            "prefix": "{prefix_name}-{field_name}".format(
+                prefix_name=self.prefix_name, field_name=name
+            ),
+        }
+
+    def get_compiled(self, form, name):
+        """
+        Return the dict that :meth:`compile` returned for this field when the
+        form class was created. Returns ``None`` if this field instance is not
+        the one declared on the form class, e.g. because it was added with
+        ``add_composite_field`` or was copied for the form instance.
+        """
+        plan = getattr(form, "composite_plan", None)
+        if plan is not None:
+            entry = plan.get(name, self)
+            if entry is not None:
+                return entry.data
+        return None
+
     def get_prefix(self, form, name):
         """
         Return the prefix that is used for the formset.
         """
-        return "{form_prefix}{prefix_name}-{field_name}".format(
-            form_prefix=form.prefix + "-" if form.prefix else "",
-            prefix_name=self.prefix_name,
-            field_name=name,
-        )
+        compiled = self.get_compiled(form, name)
+        if compiled is not None:
+            prefix = compiled["prefix"]
+        else:
+            prefix = "{prefix_name}-{field_name}".format(
+                prefix_name=self.prefix_name, field_name=name
+            )
+        if form.prefix:
+            return form.prefix + "-" + prefix
+        return prefix
 
     def get_initial(self, form, name):
         """
@@ -175,6 +301,23 @@ class FormField(CompositeField):
         """
         return self.form_class
 
+    def has_class_media(self, form, name):
+        """
+        Return ``True`` if the media of the nested form is the same for every
+        instance of the super form, see :func:`has_class_media`.
+        """
+        return has_class_media(self.get_form_class(form, name))
+
+    def get_media(self, form, name):
+        """
+        Return the media of the nested form. It is determined from the form
+        class returned by ``get_form_class``. If the form class defines its
+        own ``__init__``, the media of the nested form instance is used.
+        """
+        if not self.has_class_media(form, name):
+            return form.forms[name].media
+        return get_form_class_media(self.get_form_class(form, name))
+
     def get_form(self, form, name):
         """
         Get an instance of the form.
@@ -189,6 +332,141 @@ class FormField(CompositeField):
         return composite_form
 
 
+def get_update_fields(model_form, changed_data=None):
+    """
+    Return the names of the model fields that need to be written to save the
+    changes of ``model_form``: the concrete fields in ``changed_data`` (the
+    form's ``changed_data`` by default) and the fields with ``auto_now``.
+    Returns ``None`` if the form's instance is not saved yet.
+    """
+    instance = model_form.instance
+    if instance.pk is None or instance._state.adding:
+        return None
+    if changed_data is None:
+        changed_data = model_form.changed_data
+    concrete_fields = dict(
+        (field.name, field)
+        for field in instance._meta.concrete_fields
+        if not field.primary_key
+    )
+    update_fields = [name for name in changed_data if name in concrete_fields]
+    if update_fields:
+        update_fields.extend(
+            name for name, field in concrete_fields.items()
+            if getattr(field, "auto_now", False) and name not in update_fields
+        )
+    return update_fields
+
+
+def save_changed_fields(model_form, changed_data=None, save=None):
+    """
+    Save ``model_form`` like ``model_form.save()`` does, but if it edits an
+    existing object, only the fields returned by :func:`get_update_fields`
+    are written with ``save(update_fields=...)``. Nothing is written if no
+    model field changed. ``save`` replaces the form's ``save`` method.
+
+    Changes to the instance that are not reflected in the form's
+    ``changed_data``, e.g. attributes set in an overridden ``save()``, are
+    not written.
+    """
+    if save is None:
+        save = model_form.save
+    update_fields = get_update_fields(model_form, changed_data)
+    if update_fields is None:
+        return save(commit=True)
+    obj = save(commit=False)
+    if update_fields:
+        obj.save(update_fields=update_fields)
+    model_form.save_m2m()
+    return obj
+
+
+def _is_cached(field, instance):
+    if hasattr(field, "is_cached"):
+        return field.is_cached(instance)
+    return hasattr(instance, field.get_cache_name())
+
+
+def preload_related(instances, field_names):
+    """
+    Load the objects that the foreign keys ``field_names`` of ``instances``
+    refer to and store them on the instances. Afterwards accessing the
+    foreign keys does not query the database.
+
+    Saved instances are fetched again with ``select_related``, which loads
+    the objects of all foreign keys of all instances with a single query.
+    The objects of unsaved instances, and of foreign keys that were changed
+    since the instance was loaded, are fetched with one query per related
+    model. Relations that are already loaded are skipped.
+    """
+    if not instances or not field_names:
+        return
+    opts = instances[0]._meta
+    fields = []
+    for field_name in field_names:
+        field = opts.get_field(field_name)
+        target_fields = getattr(field, "foreign_related_fields", ())
+        if len(target_fields) != 1 or not target_fields[0].primary_key:
+            # Only foreign keys to primary keys are loaded in bulk.
+            continue
+        fields.append(field)
+
+    saved = {}
+    unsaved = []
+    for instance in instances:
+        missing = [
+            field for field in fields
+            if getattr(instance, field.attname) is not None
+            and not _is_cached(field, instance)
+        ]
+        if not missing:
+            continue
+        if instance.pk is None or instance._state.adding:
+            unsaved.extend((instance, field) for field in missing)
+        else:
+            saved.setdefault(instance._state.db, []).append((instance, missing))
+
+    for db, references in saved.items():
+        names = set(field.name for instance, missing in references for field in missing)
+        rows = opts.model._base_manager.using(db).select_related(*names).in_bulk(
+            [instance.pk for instance, missing in references]
+        )
+        for instance, missing in references:
+            row = rows.get(instance.pk)
+            for field in missing:
+                related = None
+                if row is not None and (
+                    getattr(row, field.attname) == getattr(instance, field.attname)
+                ):
+                    related = getattr(row, field.name)
+                if related is not None:
+                    setattr(instance, field.name, related)
+                else:
+                    unsaved.append((instance, field))
+
+    _preload_in_bulk(unsaved)
+
+
+def _preload_in_bulk(references):
+    """
+    Load the related objects of the ``(instance, field)`` pairs in
+    ``references`` with one query per related model and database.
+    """
+    wanted = {}
+    for instance, field in references:
+        related_model = getattr(field, "related_model", None) or field.rel.to
+        key = (related_model, instance._state.db)
+        wanted.setdefault(key, []).append(
+            (instance, field, getattr(instance, field.attname))
+        )
+    for (related_model, db), references in wanted.items():
+        pks = set(pk for instance, field, pk in references)
+        objects = related_model._base_manager.using(db).in_bulk(list(pks))
+        for instance, field, pk in references:
+            if pk in objects:
+                setattr(instance, field.name, objects[pk])
+
+
 class ModelFormField(FormField):
     """
     This class is the to :class:`~django_superform.fields.FormField` what
@@ -230,8 +508,15 @@ class ModelFormField(FormField):
         can use it within a :class:`~django_superform.forms.SuperForm`, but
         since this form type does not have a ``save()`` method, you will need
         to take care of saving the nested model form yourself.
+
+    Pass ``partial_update=True`` to write only the changed fields when the
+    nested form edits an existing object, see :func:`save_changed_fields`.
     """
 
+    def __init__(self, form_class, kwargs=None, partial_update=False, **field_kwargs):
+        super(ModelFormField, self).__init__(form_class, kwargs, **field_kwargs)
+        self.partial_update = partial_update
+
     def get_instance(self, form, name):
         """
         Provide an instance that shall be used when instantiating the
@@ -267,10 +552,16 @@ class ModelFormField(FormField):
 
         By default it will return ``False`` if the form was not changed and the
         ``empty_permitted`` argument for the form was set to ``True``. That way
-        you can allow empty forms.
+        you can allow empty forms. If the super form has ``skip_unchanged``
+        set, unchanged forms of existing objects are not saved either.
         """
-        if composite_form.empty_permitted and not composite_form.has_changed():
+        if composite_form.has_changed():
+            return True
+        if composite_form.empty_permitted:
             return False
+        if getattr(form, "skip_unchanged", False):
+            instance = composite_form.instance
+            return instance.pk is None or instance._state.adding
         return True
 
     def save(self, form, name, composite_form, commit):
@@ -283,11 +574,33 @@ class ModelFormField(FormField):
         ``True``.
         """
         if self.shall_save(form, name, composite_form):
-            return composite_form.save(commit=commit)
+            return self.save_form(form, name, composite_form, commit)
         return None
 
+    def save_form(self, form, name, composite_form, commit):
+        """
+        Save ``composite_form``. With ``partial_update`` only the changed
+        fields of an existing object are written.
+        """
+        if commit and self.partial_update:
+            return save_changed_fields(composite_form)
+        return composite_form.save(commit=commit)
+
 
 class ForeignKeyFormField(ModelFormField):
+    """
+    A :class:`~django_superform.fields.ModelFormField` for a ``ForeignKey`` of
+    the super form's model. The nested form edits the referenced object. It is
+    saved before the super form's instance so that the reference can be
+    stored together with the rest of the instance.
+
+    The ``field_name`` argument is the name of the ``ForeignKey`` on the
+    model, it defaults to the name of the composite field. ``blank``
+    overrides the model field's ``blank`` attribute.
+    """
+
+    save_before_parent = True
+
     def __init__(
         self, form_class, kwargs=None, field_name=None, blank=None, **field_kwargs
     ):
@@ -304,6 +617,26 @@ class ForeignKeyFormField(ModelFormField):
                 kwargs["empty_permitted"] = True
         return kwargs
 
+    def compile(self, form_class, name):
+        compiled = super(ForeignKeyFormField, self).compile(form_class, name)
+        meta = getattr(form_class, "_meta", None)
+        model = getattr(meta, "model", None)
+        if model is not None:
+            field_name = self.field_name or name
+            try:
+                field = model._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                pass
+            else:
+                # The referenced objects are loaded in bulk when the super
+                # form is created, see ``preload_related``.
+                compiled["related_field"] = field_name
+                # Look up the ``blank`` attribute of the model field once per
+                # form class. It is used by allow_blank().
+                if self.blank is None:
+                    compiled["model_blank"] = (model, field_name, field.blank)
+        return compiled
+
     def get_field_name(self, form, name):
         return self.field_name or name
 
@@ -315,7 +648,13 @@ class ForeignKeyFormField(ModelFormField):
         if self.blank is not None:
             return self.blank
         model = form._meta.model
-        field = model._meta.get_field(self.get_field_name(form, name))
+        field_name = self.get_field_name(form, name)
+        compiled = self.get_compiled(form, name)
+        if compiled is not None and "model_blank" in compiled:
+            compiled_model, compiled_field_name, blank = compiled["model_blank"]
+            if compiled_model is model and compiled_field_name == field_name:
+                return blank
+        field = model._meta.get_field(field_name)
         return field.blank
 
     def get_form_class(self, form, name):
@@ -326,23 +665,39 @@ class ForeignKeyFormField(ModelFormField):
         field_name = self.get_field_name(form, name)
         return getattr(form.instance, field_name)
 
+    def get_parent_fields(self, form, name):
+        """
+        Return the names of the fields on the super form's instance that are
+        changed by :meth:`save`.
+        """
+        return [self.get_field_name(form, name)]
+
+    def changes_parent(self, form, name, composite_form):
+        """
+        Return ``True`` if saving ``composite_form`` changes the reference on
+        the super form's instance. That is the case if a new object is
+        created. Call it before :meth:`save`.
+        """
+        if not self.shall_save(form, name, composite_form):
+            return False
+        instance = composite_form.instance
+        return instance.pk is None or instance._state.adding
+
     def save(self, form, name, composite_form, commit):
+        """
+        Save the nested form and assign the saved object to the super form's
+        instance. The super form's instance is not saved, this is done by
+        :meth:`django_superform.forms.SuperModelForm.save`.
+        """
         # Support the ``empty_permitted`` attribute. This is set if the field
         # is ``blank=True`` .
-        if composite_form.empty_permitted and not composite_form.has_changed():
-            saved_obj = composite_form.instance
+        if self.shall_save(form, name, composite_form):
+            saved_obj = self.save_form(form, name, composite_form, commit)
         else:
-            saved_obj = super(ForeignKeyFormField, self).save(
-                form, name, composite_form, commit
-            )
+            saved_obj = composite_form.instance
+            if saved_obj is not None and saved_obj.pk is None:
+                saved_obj = None
         setattr(form.instance, self.get_field_name(form, name), saved_obj)
-        if commit:
-            form.instance.save()
-        else:
-            raise NotImplementedError(
-                "ForeignKeyFormField cannot yet be used with non-commiting "
-                "form saves."
-            )
         return saved_obj
 
 
@@ -353,18 +708,23 @@ class FormSetField(CompositeField):
 
     You can pass the ``kwargs`` argument to specify kwargs values that
     are used when the ``formset_class`` is instantiated.
+
+    Pass ``cache_choices=True`` to evaluate the querysets of the model choice
+    fields in the formset's forms only once per super form instead of once
+    per form, see :class:`~django_superform.choices.ChoiceCache`.
     """
 
     prefix_name = "formset"
     widget = FormSetWidget
 
-    def __init__(self, formset_class, kwargs=None, **field_kwargs):
+    def __init__(self, formset_class, kwargs=None, cache_choices=False, **field_kwargs):
         super(FormSetField, self).__init__(**field_kwargs)
 
         self.formset_class = formset_class
         if kwargs is None:
             kwargs = {}
         self.default_kwargs = kwargs
+        self.cache_choices = cache_choices
 
     def get_formset_class(self, form, name):
         """
@@ -374,6 +734,24 @@ class FormSetField(CompositeField):
         """
         return self.formset_class
 
+    def has_class_media(self, form, name):
+        """
+        Return ``True`` if the media of the nested formset is the same for
+        every instance of the super form, see :func:`has_class_media`.
+        """
+        return has_class_media(self.get_formset_class(form, name).form)
+
+    def get_media(self, form, name):
+        """
+        Return the media of the nested formset. It is determined from the
+        form class used by the formset class returned by
+        ``get_formset_class``. If the form class defines its own
+        ``__init__``, the media of the formset instance is used.
+        """
+        if not self.has_class_media(form, name):
+            return form.formsets[name].media
+        return get_form_class_media(self.get_formset_class(form, name).form)
+
     def get_formset(self, form, name):
         """
         Get an instance of the formset.
@@ -385,18 +763,306 @@ class FormSetField(CompositeField):
             form.files if form.is_bound else None,
             **kwargs
         )
+        instrumentation.bind_formset(form, name, formset, self)
+        self.prepare_formset(form, name, formset)
         return formset
 
+    def prepare_formset(self, form, name, formset):
+        """
+        Called with every formset created by :meth:`get_formset`, before the
+        formset's forms are built.
+        """
+        if self.cache_choices:
+            self.get_choice_cache(form).apply_formset(formset)
+
+    def get_choice_cache(self, form):
+        """
+        Return the :class:`~django_superform.choices.ChoiceCache` that is
+        shared by all formsets of the super form ``form``.
+        """
+        cache = getattr(form, "_choice_cache", None)
+        if cache is None:
+            cache = form._choice_cache = ChoiceCache()
+        return cache
+
+
+def can_return_pks_from_bulk_insert(model):
+    """
+    Return ``True`` if the database used for ``model`` sets the primary keys
+    on objects created with ``bulk_create``.
+    """
+    features = connections[router.db_for_write(model)].features
+    return getattr(
+        features,
+        "can_return_rows_from_bulk_insert",
+        getattr(features, "can_return_ids_from_bulk_insert", False),
+    )
+
 
 class ModelFormSetField(FormSetField):
+    """
+    A :class:`~django_superform.fields.FormSetField` for model formsets. The
+    formset is saved when the super form is saved.
+
+    Pass ``bulk_save=True`` to save the formset with a constant number of
+    queries instead of one query per form: new objects are created with
+    ``bulk_create``, changed objects are updated with ``bulk_update`` (only
+    the changed fields) and deleted objects are removed with a single
+    ``DELETE`` query. Keep in mind that no ``save()`` or ``delete()`` methods
+    of the model are called and no ``pre_save``/``post_save`` signals are
+    sent in that case. Objects of forms with many-to-many data are created one
+    by one if the database cannot return the primary keys from a bulk insert.
+    On Django versions without ``bulk_update`` the changed objects are saved
+    one by one with ``update_fields``.
+
+    Pass ``batch_unique=True`` to validate the unique constraints of all forms
+    with one query per constraint, see
+    :class:`~django_superform.unique.BatchUniqueValidation`.
+
+    The ``select_related``, ``prefetch_related``, ``only`` and ``defer``
+    arguments are applied to the queryset of the formset, e.g.
+    ``select_related=["author"]``. ``select_related=True`` follows all
+    non-null foreign keys. That avoids a query per form for related objects
+    used while the forms are rendered or validated. Django still validates
+    the primary key of every posted form with its own query.
+
+    Pass ``delta=True`` to accept delta submissions, in which the client
+    posts only the added, changed and deleted rows instead of the whole
+    collection, see :class:`~django_superform.delta.DeltaSubmission`. The
+    ``min_num`` and ``max_num`` checks of the formset then only count the
+    posted rows.
+
+    Pass ``window_size`` to show only a window of that many objects in an
+    unbound formset, starting at the offset returned by :meth:`get_window`.
+    Only the objects in the window are queried and only their forms are
+    built and rendered. The management form counts the rows of the window
+    and the forms are numbered from zero. A bound windowed formset is a delta
+    submission of the posted rows, so the other objects are not loaded,
+    validated or saved either.
+    """
+
+    copied_attributes = FormSetField.copied_attributes + (
+        "select_related", "prefetch_related", "only", "defer",
+    )
+
+    def __init__(
+        self,
+        formset_class,
+        kwargs=None,
+        bulk_save=False,
+        batch_unique=False,
+        select_related=None,
+        prefetch_related=None,
+        only=None,
+        defer=None,
+        delta=False,
+        window_size=None,
+        **field_kwargs
+    ):
+        super(ModelFormSetField, self).__init__(formset_class, kwargs, **field_kwargs)
+        self.bulk_save = bulk_save
+        self.batch_unique = batch_unique
+        self.delta = delta
+        self.window_size = window_size
+        self.select_related = select_related
+        self.prefetch_related = prefetch_related
+        self.only = only
+        self.defer = defer
+
+    def get_formset_model(self, form, name):
+        return self.get_formset_class(form, name).model
+
+    def get_queryset(self, form, name, queryset=None):
+        """
+        Return the queryset for the formset with the ``select_related``,
+        ``prefetch_related``, ``only`` and ``defer`` options applied to it.
+        If ``queryset`` is not given, the model's default manager is used.
+        """
+        if queryset is None:
+            queryset = self.get_formset_model(form, name)._default_manager.all()
+        if self.select_related is True:
+            queryset = queryset.select_related()
+        elif self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only:
+            queryset = queryset.only(*self.only)
+        if self.defer:
+            queryset = queryset.defer(*self.defer)
+        return queryset
+
+    def get_kwargs(self, form, name):
+        """
+        Adds the ``queryset`` kwarg if one of the queryset options is set.
+        """
+        kwargs = super(ModelFormSetField, self).get_kwargs(form, name)
+        if self.select_related or self.prefetch_related or self.only or self.defer:
+            kwargs["queryset"] = self.get_queryset(
+                form, name, kwargs.get("queryset")
+            )
+        return kwargs
+
+    def get_window(self, form, name):
+        """
+        Return the ``(offset, limit)`` of the objects shown by the unbound
+        formset or ``None`` if it is not windowed. The offset is taken from
+        the initial data of the super form, e.g. ``{"comments_offset": 50}``
+        for the field ``comments``.
+        """
+        if not self.window_size:
+            return None
+        offset = 0
+        if hasattr(form, "initial"):
+            offset = form.initial.get("%s_offset" % name, 0)
+        return max(int(offset), 0), self.window_size
+
+    def get_window_queryset(self, form, name, queryset, window):
+        """
+        Return the objects of ``queryset`` in ``window``. Override this to
+        paginate with a cursor instead of an offset.
+        """
+        offset, limit = window
+        if not queryset.ordered:
+            queryset = queryset.order_by(queryset.model._meta.pk.name)
+        return queryset[offset:offset + limit]
+
+    def prepare_formset(self, form, name, formset):
+        """
+        Installs the delta submission mode, restricts an unbound windowed
+        formset to its window and installs the batched unique validation.
+        If the formset's forms are super forms with foreign key form fields,
+        the referenced objects are loaded together with the formset's
+        objects.
+        """
+        if getattr(formset.form, "preload_foreign_keys", False):
+            related_fields = formset.form.composite_plan.related_fields
+            if related_fields:
+                queryset = formset.queryset
+                if queryset is None:
+                    queryset = formset.model._default_manager.all()
+                formset.queryset = queryset.select_related(*related_fields)
+        window = self.get_window(form, name)
+        if formset.is_bound:
+            if self.delta or window is not None:
+                DeltaSubmission(formset).install()
+        elif window is not None:
+            queryset = formset.queryset
+            if queryset is None:
+                queryset = formset.model._default_manager.all()
+            formset.queryset = self.get_window_queryset(
+                form, name, queryset, window
+            )
+        if self.batch_unique:
+            BatchUniqueValidation(formset).install()
+        super(ModelFormSetField, self).prepare_formset(form, name, formset)
+
     def shall_save(self, form, name, formset):
+        """
+        Return ``True`` if the formset shall be saved. If the super form has
+        ``skip_unchanged`` set, unchanged formsets are not saved.
+        """
+        if getattr(form, "skip_unchanged", False):
+            return formset.has_changed()
         return True
 
     def save(self, form, name, formset, commit):
         if self.shall_save(form, name, formset):
+            if self.bulk_save and commit:
+                return self.save_bulk(form, name, formset)
             return formset.save(commit=commit)
         return None
 
+    def save_bulk(self, form, name, formset):
+        """
+        Save the formset with bulk queries. This sets the same
+        ``changed_objects``, ``deleted_objects`` and ``new_objects``
+        attributes on the formset as its ``save()`` method does and returns
+        the list of saved objects.
+        """
+        model = formset.model
+        queryset = model._default_manager.all()
+        concrete_fields = dict(
+            (field.name, field)
+            for field in model._meta.concrete_fields
+            if not field.primary_key
+        )
+        auto_now_fields = [
+            field for field in concrete_fields.values()
+            if getattr(field, "auto_now", False)
+        ]
+        m2m_names = set(field.name for field in model._meta.many_to_many)
+
+        formset.changed_objects = []
+        formset.deleted_objects = []
+        formset.new_objects = []
+        saved_forms = []
+
+        update_fields = set()
+        deleted_forms = formset.deleted_forms
+        for composite_form in formset.initial_forms:
+            obj = composite_form.instance
+            if obj.pk is None:
+                continue
+            if composite_form in deleted_forms:
+                formset.deleted_objects.append(obj)
+            elif composite_form.has_changed():
+                obj = composite_form.save(commit=False)
+                changed_data = composite_form.changed_data
+                formset.changed_objects.append((obj, changed_data))
+                update_fields.update(n for n in changed_data if n in concrete_fields)
+                saved_forms.append(composite_form)
+
+        # Parent foreign key of inline formsets. The parent might have been
+        # saved after the formset was created.
+        fk = getattr(formset, "fk", None)
+        create_one_by_one = []
+        for composite_form in formset.extra_forms:
+            if not composite_form.has_changed():
+                continue
+            if formset.can_delete and formset._should_delete_form(composite_form):
+                continue
+            obj = composite_form.save(commit=False)
+            if fk is not None:
+                setattr(obj, fk.name, formset.instance)
+            if m2m_names.intersection(composite_form.cleaned_data):
+                create_one_by_one.append(obj)
+            formset.new_objects.append(obj)
+            saved_forms.append(composite_form)
+
+        if formset.deleted_objects:
+            queryset.filter(
+                pk__in=[obj.pk for obj in formset.deleted_objects]
+            ).delete()
+
+        changed_objects = [obj for obj, _ in formset.changed_objects]
+        if changed_objects and update_fields:
+            for field in auto_now_fields:
+                update_fields.add(field.name)
+                for obj in changed_objects:
+                    field.pre_save(obj, False)
+            update_fields = sorted(update_fields)
+            if hasattr(queryset, "bulk_update"):
+                queryset.bulk_update(changed_objects, update_fields)
+            else:
+                for obj in changed_objects:
+                    obj.save(update_fields=update_fields)
+
+        if can_return_pks_from_bulk_insert(model):
+            create_one_by_one = []
+        one_by_one_ids = set(id(obj) for obj in create_one_by_one)
+        bulk_objects = [
+            obj for obj in formset.new_objects if id(obj) not in one_by_one_ids
+        ]
+        if bulk_objects:
+            queryset.bulk_create(bulk_objects)
+        for obj in create_one_by_one:
+            obj.save()
+
+        for composite_form in saved_forms:
+            composite_form.save_m2m()
+        return changed_objects + formset.new_objects
+
 
 class InlineFormSetField(ModelFormSetField):
     """
@@ -425,6 +1091,14 @@ class InlineFormSetField(ModelFormSetField):
     All other not mentioned keyword arguments, like ``extra``, ``max_num`` etc.
     will be passed directly to the ``inlineformset_factory``.
 
+    The formset classes created by the ``inlineformset_factory`` are cached
+    in ``InlineFormSetField.formset_class_cache`` and shared between all
+    fields using the same models and factory arguments. So the class is only
+    built once and not for every instantiation of the super form. Pass
+    ``cache_formset_class=False`` to build a new class every time instead.
+    Hits and misses can be inspected with
+    ``InlineFormSetField.formset_class_cache.stats()``.
+
     Example:
 
         class Gallery(models.Model):
@@ -445,12 +1119,19 @@ class InlineFormSetField(ModelFormSetField):
                 extra=1)
     """
 
+    copied_attributes = ModelFormSetField.copied_attributes + (
+        "formset_factory_kwargs",
+    )
+
+    formset_class_cache = LRUCache(maxsize=256)
+
     def __init__(
         self,
         parent_model=None,
         model=None,
         formset_class=None,
         kwargs=None,
+        cache_formset_class=True,
         **factory_kwargs
     ):
         """
@@ -465,12 +1146,17 @@ class InlineFormSetField(ModelFormSetField):
         # Make sure that all standard arguments will get passed through to the
         # parent's __init__ method.
         field_kwargs = {}
-        for arg in ["required", "widget", "label", "help_text", "localize"]:
+        for arg in [
+            "required", "widget", "label", "help_text", "localize", "bulk_save",
+            "cache_choices", "batch_unique", "select_related", "prefetch_related",
+            "only", "defer", "delta", "window_size",
+        ]:
             if arg in factory_kwargs:
                 field_kwargs[arg] = factory_kwargs.pop(arg)
 
         self.parent_model = parent_model
         self.model = model
+        self.cache_formset_class = cache_formset_class
         self.formset_factory_kwargs = factory_kwargs
         super(InlineFormSetField, self).__init__(
             formset_class, kwargs=kwargs, **field_kwargs
@@ -503,12 +1189,22 @@ class InlineFormSetField(ModelFormSetField):
         """
         if self.formset_class is not None:
             return self.formset_class
-        formset_class = inlineformset_factory(
-            self.get_parent_model(form, name),
-            self.get_model(form, name),
-            **self.formset_factory_kwargs
-        )
-        return formset_class
+        parent_model = self.get_parent_model(form, name)
+        model = self.get_model(form, name)
+
+        def build():
+            return inlineformset_factory(
+                parent_model, model, **self.formset_factory_kwargs
+            )
+
+        if not self.cache_formset_class:
+            return build()
+        try:
+            key = make_key(parent_model, model, self.formset_factory_kwargs)
+        except TypeError:
+            # Some factory argument is not hashable, we cannot cache that.
+            return build()
+        return self.formset_class_cache.get_or_create(key, build)
 
     def get_kwargs(self, form, name):
         kwargs = super(InlineFormSetField, self).get_kwargs(form, name)
@@ -75,20 +75,231 @@ You're welcome.
 
 """
 
-from functools import reduce
+from contextlib import contextmanager
+
 from django import forms
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, router, transaction
 from django.forms.forms import DeclarativeFieldsMetaclass, ErrorDict, ErrorList
 from django.forms.models import ModelFormMetaclass
 from django.utils import six
 import copy
 
-from .fields import CompositeField
+from . import instrumentation
+from .fields import CompositeField, preload_related, save_changed_fields
 
 try:
     from collections import OrderedDict
 except ImportError:
     from django.utils.datastructures import SortedDict as OrderedDict
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # Python 2 without the ``futures`` backport installed.
+    ThreadPoolExecutor = None
+
+
+@contextmanager
+def _no_transaction():
+    yield
+
+
+def _clean_in_thread(form, name, composite, stack):
+    """
+    Clean the given nested form or formset in a worker thread. Django opens
+    a database connection per thread, so we close the ones the worker might
+    have opened afterwards.
+    """
+    try:
+        with instrumentation.restore_stack(stack):
+            form._clean_composite(name, composite)
+    finally:
+        for connection in connections.all():
+            connection.close()
+
+
+class CompositeFieldsDict(OrderedDict):
+    """
+    The per-instance ``composite_fields`` dictionary of a super form.
+
+    It is initialized with the class-wide field instances from
+    ``base_composite_fields``, which act as immutable prototypes and are
+    shared by all form instances. A field is only copied for the instance
+    once it is looked up with ``composite_fields[name]`` (or ``get``,
+    ``values``, ``items``), so changes made to it don't leak into other
+    instances. Fields that are assigned to the dictionary belong to the
+    instance already and are not copied.
+
+    Internally the super form reads the fields with :meth:`lookup` and
+    :meth:`lookup_items`, which never create a copy.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._owned = set()
+        super(CompositeFieldsDict, self).__init__(*args, **kwargs)
+        # Everything passed into the constructor is a shared prototype.
+        self._owned.clear()
+
+    def __getitem__(self, name):
+        field = super(CompositeFieldsDict, self).__getitem__(name)
+        if name not in self._owned:
+            field = copy.deepcopy(field)
+            super(CompositeFieldsDict, self).__setitem__(name, field)
+            self._owned.add(name)
+        return field
+
+    def __setitem__(self, name, field):
+        super(CompositeFieldsDict, self).__setitem__(name, field)
+        self._owned.add(name)
+
+    def __delitem__(self, name):
+        super(CompositeFieldsDict, self).__delitem__(name)
+        self._owned.discard(name)
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        return default
+
+    def values(self):
+        return [self[name] for name in self]
+
+    def items(self):
+        return [(name, self[name]) for name in self]
+
+    def lookup(self, name):
+        """
+        Return the field for ``name`` without copying it. The returned field
+        might be shared with other form instances and must not be modified.
+        """
+        return super(CompositeFieldsDict, self).__getitem__(name)
+
+    def lookup_items(self):
+        """
+        Like ``items()`` but does not copy the fields. See :meth:`lookup`.
+        """
+        return [(name, self.lookup(name)) for name in self]
+
+
+class LazyCompositeDict(OrderedDict):
+    """
+    Holds the nested form or formset instances of a super form (that is
+    ``form.forms`` and ``form.formsets``).
+
+    Entries can be added with :meth:`add_lazy`. They are then only created by
+    calling ``build(name)`` when they are accessed for the first time.
+    """
+
+    def __init__(self, build):
+        super(LazyCompositeDict, self).__init__()
+        self._build = build
+        self._pending = set()
+
+    def add_lazy(self, name):
+        super(LazyCompositeDict, self).__setitem__(name, None)
+        self._pending.add(name)
+
+    def is_built(self, name):
+        return name in self and name not in self._pending
+
+    def __getitem__(self, name):
+        if name in self._pending:
+            value = self._build(name)
+            super(LazyCompositeDict, self).__setitem__(name, value)
+            self._pending.discard(name)
+            return value
+        return super(LazyCompositeDict, self).__getitem__(name)
+
+    def __setitem__(self, name, value):
+        super(LazyCompositeDict, self).__setitem__(name, value)
+        self._pending.discard(name)
+
+    def __delitem__(self, name):
+        super(LazyCompositeDict, self).__delitem__(name)
+        self._pending.discard(name)
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        return default
+
+    def values(self):
+        return [self[name] for name in self]
+
+    def items(self):
+        return [(name, self[name]) for name in self]
+
+
+class CompositePlanEntry(object):
+    """
+    The compiled information about a single composite field of a form class.
+    See :class:`CompositeFieldPlan`.
+    """
+
+    def __init__(self, form_class, name, field):
+        self.name = name
+        self.field = field
+        self.is_form = hasattr(field, "get_form")
+        self.is_formset = hasattr(field, "get_formset")
+        self.savable = hasattr(field, "save")
+        self.save_before_parent = getattr(field, "save_before_parent", False)
+        self.data = field.compile(form_class, name)
+
+
+class CompositeFieldPlan(object):
+    """
+    Compiled once per form class by the metaclass. It records for every
+    declared composite field whether it provides a form or a formset, if it
+    can be saved and everything the field can compute ahead of time with
+    :meth:`~django_superform.fields.CompositeField.compile` (like the prefix
+    template).
+
+    The entries reference the class-wide field instances. When a form
+    instance replaced or copied a field, :meth:`entry_for` will compile a new
+    entry on the fly.
+    """
+
+    def __init__(self, form_class, fields):
+        self.form_class = form_class
+        self.entries = OrderedDict(
+            (name, CompositePlanEntry(form_class, name, field))
+            for name, field in fields.items()
+        )
+        # The combined media of all composite fields, see SuperFormMixin.media.
+        self.media = None
+        self.form_names = [e.name for e in self.entries.values() if e.is_form]
+        self.formset_names = [
+            e.name for e in self.entries.values() if e.is_formset
+        ]
+        # The foreign keys of the model instance that are edited by nested
+        # forms, see SuperModelFormMixin.preload_foreign_keys.
+        self.related_fields = [
+            e.data["related_field"]
+            for e in self.entries.values()
+            if "related_field" in e.data
+        ]
+
+    def get(self, name, field):
+        """
+        Return the compiled entry for ``name`` if it was compiled for the
+        given ``field`` instance. Return ``None`` otherwise.
+        """
+        entry = self.entries.get(name)
+        if entry is not None and entry.field is field:
+            return entry
+        return None
+
+    def entry_for(self, name, field):
+        """
+        Like :meth:`get` but compiles a new entry if ``field`` is not the one
+        known to the plan.
+        """
+        entry = self.get(name, field)
+        if entry is None:
+            entry = CompositePlanEntry(self.form_class, name, field)
+        return entry
+
 
 class DeclerativeCompositeFieldsMetaclass(type):
     """
@@ -125,6 +336,7 @@ class DeclerativeCompositeFieldsMetaclass(type):
 
         new_class.base_composite_fields = declared_fields
         new_class.declared_composite_fields = declared_fields
+        new_class.composite_plan = CompositeFieldPlan(new_class, declared_fields)
 
         return new_class
 
@@ -168,21 +380,52 @@ class SuperFormMixin(object):
 
     Cleaning, validation, etc. should work totally transparent. See the
     :ref:`Quickstart Guide <quickstart>` for how superforms are used.
+
+    Set ``lazy_composite_fields = True`` on the form class to not create the
+    nested forms and formsets in ``__init__``. Every entry in ``self.forms``
+    and ``self.formsets`` is then created when it is used for the first time.
+
+    Set ``parallel_clean = True`` to clean the nested forms and formsets
+    concurrently in a thread pool with ``parallel_clean_workers`` threads.
+    Set ``clean_executor`` to an executor to share it between form instances
+    instead of starting a new pool for every form. This helps if the nested forms do I/O bound validation. Keep in mind that
+    every thread uses its own database connection, so queries issued during
+    the validation will not see uncommitted changes of the current
+    transaction.
     """
 
+    lazy_composite_fields = False
+
+    parallel_clean = False
+    parallel_clean_workers = 4
+    clean_executor = None
+
+    _composite_media = None
+    _dynamic_composite_fields = False
+    _instrumentation = None
+
     def __init__(self, *args, **kwargs):
         super(SuperFormMixin, self).__init__(*args, **kwargs)
+        self._composite_bound_fields_cache = {}
+        self._composite_plan_entries = {}
+        self._instrumentation = instrumentation.bind(self)
         self._init_composite_fields()
 
     def __getitem__(self, name):
         """
         Returns a ``django.forms.BoundField`` for the given field name. It also
         returns :class:`~django_superform.boundfield.CompositeBoundField`
-        instances for composite fields.
+        instances for composite fields. Like Django's bound fields they are
+        created only once per form instance, unless the field is copied or
+        replaced in ``composite_fields`` afterwards.
         """
         if name not in self.fields and name in self.composite_fields:
-            field = self.composite_fields[name]
-            return field.get_bound_field(self, name)
+            field = self.composite_fields.lookup(name)
+            bound_field = self._composite_bound_fields_cache.get(name)
+            if bound_field is None or bound_field.field is not field:
+                bound_field = field.get_bound_field(self, name)
+                self._composite_bound_fields_cache[name] = bound_field
+            return bound_field
         return super(SuperFormMixin, self).__getitem__(name)
 
     def add_composite_field(self, name, field):
@@ -191,25 +434,98 @@ class SuperFormMixin(object):
         initialize it appropriatly.
         """
         self.composite_fields[name] = field
+        self._composite_bound_fields_cache.pop(name, None)
+        self._dynamic_composite_fields = True
+        self._composite_media = None
         self._init_composite_field(name, field)
 
+    def has_changed(self):
+        """
+        Return ``True`` if the form's own fields or any nested form or formset
+        changed. Stops at the first change that is found.
+        """
+        if self._own_changed_data():
+            return True
+        for name in self.composite_fields:
+            if self.get_composite_field_value(name).has_changed():
+                return True
+        return False
+
+    @property
+    def changed_data(self):
+        """
+        The names of the changed fields. Changes in nested forms are reported
+        with the path of the field, e.g. ``address.street`` for a nested form
+        or ``emails.0.email`` for the first form of a formset.
+        """
+        changed_data = list(self._own_changed_data())
+        for name in self.composite_fields:
+            composite = self.get_composite_field_value(name)
+            if self._get_plan_entry(name).is_formset:
+                for i, form in enumerate(composite.forms):
+                    changed_data.extend(
+                        "{0}.{1}.{2}".format(name, i, field_name)
+                        for field_name in form.changed_data
+                    )
+            else:
+                changed_data.extend(
+                    "{0}.{1}".format(name, field_name)
+                    for field_name in composite.changed_data
+                )
+        return changed_data
+
+    def _own_changed_data(self):
+        return super(SuperFormMixin, self).changed_data
+
     def get_composite_field_value(self, name):
         """
         Return the form/formset instance for the given field name.
         """
-        field = self.composite_fields[name]
-        if hasattr(field, "get_form"):
+        entry = self._get_plan_entry(name)
+        if entry.is_form:
             return self.forms[name]
-        if hasattr(field, "get_formset"):
+        if entry.is_formset:
             return self.formsets[name]
 
+    def _get_plan_entry(self, name, field=None):
+        if field is None:
+            field = self.composite_fields.lookup(name)
+        entry = self.composite_plan.get(name, field)
+        if entry is None:
+            # The field was copied or replaced for this instance. Its entry
+            # is compiled once and kept until the field changes again.
+            entry = self._composite_plan_entries.get(name)
+            if entry is None or entry.field is not field:
+                entry = self.composite_plan.entry_for(name, field)
+                self._composite_plan_entries[name] = entry
+        return entry
+
     def _init_composite_field(self, name, field):
-        if hasattr(field, "get_form"):
-            form = field.get_form(self, name)
-            self.forms[name] = form
-        if hasattr(field, "get_formset"):
-            formset = field.get_formset(self, name)
-            self.formsets[name] = formset
+        entry = self._get_plan_entry(name, field)
+        if entry.is_form:
+            if self.lazy_composite_fields:
+                self.forms.add_lazy(name)
+            else:
+                with instrumentation.measure(self, name, "init", field):
+                    form = field.get_form(self, name)
+                self.forms[name] = form
+        if entry.is_formset:
+            if self.lazy_composite_fields:
+                self.formsets.add_lazy(name)
+            else:
+                with instrumentation.measure(self, name, "init", field):
+                    formset = field.get_formset(self, name)
+                self.formsets[name] = formset
+
+    def _build_composite_form(self, name):
+        field = self.composite_fields.lookup(name)
+        with instrumentation.measure(self, name, "init", field):
+            return field.get_form(self, name)
+
+    def _build_composite_formset(self, name):
+        field = self.composite_fields.lookup(name)
+        with instrumentation.measure(self, name, "init", field):
+            return field.get_formset(self, name)
 
     def _init_composite_fields(self):
         """
@@ -218,13 +534,15 @@ class SuperFormMixin(object):
         # The base_composite_fields class attribute is the *class-wide*
         # definition of fields. Because a particular *instance* of the class
         # might want to alter self.composite_fields, we create
-        # self.composite_fields here by copying base_composite_fields.
+        # self.composite_fields here from base_composite_fields. The fields
+        # are only copied when they are accessed through
+        # self.composite_fields[name], see CompositeFieldsDict.
         # Instances should always modify self.composite_fields; they should not
         # modify base_composite_fields.
-        self.composite_fields = copy.deepcopy(self.base_composite_fields)
-        self.forms = OrderedDict()
-        self.formsets = OrderedDict()
-        for name, field in self.composite_fields.items():
+        self.composite_fields = CompositeFieldsDict(self.base_composite_fields)
+        self.forms = LazyCompositeDict(self._build_composite_form)
+        self.formsets = LazyCompositeDict(self._build_composite_formset)
+        for name, field in self.composite_fields.lookup_items():
             self._init_composite_field(name, field)
 
     def full_clean(self):
@@ -234,26 +552,112 @@ class SuperFormMixin(object):
         they actually contain errors.
         """
         super(SuperFormMixin, self).full_clean()
-        for field_name, composite in self.forms.items():
-            composite.full_clean()
+        composites = [
+            (field_name, composite, ErrorDict)
+            for field_name, composite in self.forms.items()
+        ]
+        composites.extend(
+            (field_name, composite, ErrorList)
+            for field_name, composite in self.formsets.items()
+        )
+        if self.parallel_clean and len(composites) > 1:
+            self._clean_composites_parallel(
+                [(name, composite) for name, composite, _ in composites]
+            )
+        else:
+            for name, composite, _ in composites:
+                self._clean_composite(name, composite)
+        # Merge errors in declaration order, regardless of how the composites
+        # were cleaned.
+        for field_name, composite, error_class in composites:
             if not composite.is_valid() and composite._errors:
-                self._errors[field_name] = ErrorDict(composite._errors)
-        for field_name, composite in self.formsets.items():
+                self._errors[field_name] = error_class(composite._errors)
+
+    def get_clean_executor(self):
+        """
+        Return the executor that is used to clean nested forms and formsets
+        if ``parallel_clean`` is enabled. That is ``clean_executor`` if it is
+        set. Otherwise a new thread pool is created for this form, which the
+        form shuts down after cleaning.
+        """
+        if self.clean_executor is not None:
+            return self.clean_executor
+        if ThreadPoolExecutor is None:
+            raise ImproperlyConfigured(
+                "parallel_clean requires the 'futures' package on Python 2."
+            )
+        return ThreadPoolExecutor(max_workers=self.parallel_clean_workers)
+
+    def _clean_composite(self, name, composite):
+        field = self.composite_fields.lookup(name)
+        with instrumentation.measure(self, name, "clean", field):
             composite.full_clean()
-            if not composite.is_valid() and composite._errors:
-                self._errors[field_name] = ErrorList(composite._errors)
+
+    def _clean_composites_parallel(self, composites):
+        executor = self.get_clean_executor()
+        # A shared executor is left running for the next form.
+        owned = executor is not self.clean_executor
+        stack = instrumentation.get_stack()
+        try:
+            futures = [
+                executor.submit(_clean_in_thread, self, name, composite, stack)
+                for name, composite in composites
+            ]
+            # Re-raise exceptions of the workers in declaration order.
+            for future in futures:
+                future.result()
+        finally:
+            if owned:
+                executor.shutdown(wait=True)
+
+    def stream(self):
+        """
+        Render the form and all its composite fields and yield the HTML in
+        chunks: first the form's own fields, then every composite field in
+        declaration order, formsets one form at a time. Pass it to a
+        ``StreamingHttpResponse`` to send large forms without building the
+        whole page in memory first.
+        """
+        yield six.text_type(self)
+        for name in self.composite_fields:
+            for chunk in self[name].stream():
+                yield chunk
 
     @property
     def media(self):
         """
         Incooperate composite field's media.
+
+        The media of the composite fields is determined from the nested form
+        and formset classes, so no nested form needs to be instantiated. It
+        is computed only once per super form class. It is computed again for
+        every form instance after a call to ``add_composite_field`` or if a
+        nested form class defines its own ``__init__``, which might change
+        the widgets.
         """
-        media_list = []
-        media_list.append(super(SuperFormMixin, self).media)
-        for composite_name in self.composite_fields.keys():
-            form = self.get_composite_field_value(composite_name)
-            media_list.append(form.media)
-        return reduce(lambda a, b: a + b, media_list)
+        media = self._composite_media
+        if media is None:
+            if self._dynamic_composite_fields:
+                fields = self.composite_fields.lookup_items()
+                media = self._collect_composite_media(fields)
+            else:
+                plan = self.composite_plan
+                media = plan.media
+                if media is None:
+                    fields = [(e.name, e.field) for e in plan.entries.values()]
+                    media = self._collect_composite_media(fields)
+                    if all(
+                        field.has_class_media(self, name) for name, field in fields
+                    ):
+                        plan.media = media
+            self._composite_media = media
+        return super(SuperFormMixin, self).media + media
+
+    def _collect_composite_media(self, fields):
+        media = forms.Media()
+        for name, field in fields:
+            media = media + field.get_media(self, name)
+        return media
 
 
 class SuperModelFormMixin(SuperFormMixin):
@@ -271,8 +675,44 @@ class SuperModelFormMixin(SuperFormMixin):
                 SuperModelFormMixin,
                 MyCustomModelForm)):
             pass
+
+    Set ``atomic_save = True`` on the form class to save the super form and
+    all nested forms and formsets in a single transaction. If you also set
+    ``atomic_savepoints = True``, the save of every composite field is
+    wrapped in its own savepoint.
+
+    Set ``skip_unchanged = True`` to not save anything that did not change:
+    the super form's instance, nested model forms of existing objects and
+    formsets are only saved if they have changes. Submitting an unchanged
+    form then does not write to the database at all.
+
+    Set ``partial_update = True`` to write only the changed fields of an
+    existing instance with ``save(update_fields=...)``. Nested
+    :class:`~django_superform.fields.ModelFormField` take a
+    ``partial_update`` argument that does the same for their objects.
+
+    The objects that the nested forms of
+    :class:`~django_superform.fields.ForeignKeyFormField` edit are loaded
+    together with a single ``select_related`` query before the nested forms
+    are created. Set ``preload_foreign_keys = False`` to load every object on
+    its own when it is accessed. Lazy super forms never preload.
     """
 
+    atomic_save = False
+    atomic_savepoints = False
+
+    skip_unchanged = False
+    partial_update = False
+
+    preload_foreign_keys = True
+
+    def _init_composite_fields(self):
+        if self.preload_foreign_keys and not self.lazy_composite_fields:
+            preload_related(
+                [self.instance], self.composite_plan.related_fields
+            )
+        super(SuperModelFormMixin, self)._init_composite_fields()
+
     def save(self, commit=True):
         """
         When saving a super model form, the nested forms and formsets will be
@@ -282,14 +722,21 @@ class SuperModelFormMixin(SuperFormMixin):
 
         .. code:: python
 
-            saved_obj = self.save_form()
-            self.save_forms()
-            self.save_formsets()
+            if commit:
+                self.save_forms_before_parent()
+            saved_obj = self.save_form(commit=commit)
+            self.save_forms(commit=commit)
+            self.save_formsets(commit=commit)
             return saved_obj
 
         That makes it easy to override it in order to change the order in which
         things are saved.
 
+        The nested forms of fields like
+        :class:`~django_superform.fields.ForeignKeyFormField` are saved before
+        the super form, because the super form's instance references their
+        objects. That way the super form's instance is written only once.
+
         The ``.save()`` method will return only a single model instance even if
         nested forms are saved as well. That keeps the API similiar to what
         Django's model forms are offering.
@@ -298,19 +745,68 @@ class SuperModelFormMixin(SuperFormMixin):
         ``save_m2m`` method to the form instance, so that you can call it
         manually later. When you call ``save_m2m``, the ``save_forms`` and
         ``save_formsets`` methods will be executed as well so again all nested
-        forms are taken care of transparantly.
+        forms are taken care of transparantly. The nested forms of
+        ``ForeignKeyFormField`` are saved in ``save_m2m`` as well and the
+        references to them are then written to the super form's instance in
+        a single ``UPDATE``.
+
+        If ``atomic_save`` is set, everything is saved in a single
+        transaction. With ``commit=False`` the ``save_m2m`` method runs in a
+        transaction instead.
         """
-        saved_obj = self.save_form(commit=commit)
-        self.save_forms(commit=commit)
-        self.save_formsets(commit=commit)
+        self._saved_before_parent = ()
+        try:
+            with self.save_transaction(commit):
+                if commit:
+                    self.save_forms_before_parent()
+                saved_obj = self.save_form(commit=commit)
+                self.save_forms(commit=commit)
+                self.save_formsets(commit=commit)
+        finally:
+            self._saved_before_parent = ()
+
+        if self.atomic_save and not commit and hasattr(self, "save_m2m"):
+            save_m2m = self.save_m2m
+
+            def atomic_save_m2m():
+                with self.save_transaction(True):
+                    save_m2m()
+
+            self.save_m2m = atomic_save_m2m
         return saved_obj
 
+    def get_save_database(self):
+        """
+        Return the database alias that is used for the transaction when
+        ``atomic_save`` is set.
+        """
+        return router.db_for_write(self.instance.__class__, instance=self.instance)
+
+    def save_transaction(self, commit=True):
+        """
+        Return the context manager that wraps the whole save if
+        ``atomic_save`` is set. Nothing is written to the database if
+        ``commit=False``, so no transaction is used then.
+        """
+        if self.atomic_save and commit:
+            return transaction.atomic(using=self.get_save_database())
+        return _no_transaction()
+
+    def _save_composite(self, field, name, composite, commit):
+        with instrumentation.measure(self, name, "save", field):
+            if self.atomic_savepoints and commit:
+                with transaction.atomic(using=self.get_save_database()):
+                    return field.save(self, name, composite, commit=commit)
+            return field.save(self, name, composite, commit=commit)
+
     def _extend_save_m2m(self, name, composites):
         additional_save_m2m = []
         for composite in composites:
             if hasattr(composite, "save_m2m"):
                 additional_save_m2m.append(composite.save_m2m)
+        self._chain_save_m2m(name, additional_save_m2m)
 
+    def _chain_save_m2m(self, name, additional_save_m2m):
         if not additional_save_m2m:
             return
 
@@ -334,6 +830,18 @@ class SuperModelFormMixin(SuperFormMixin):
         self.save_m2m = augmented_save_m2m
         setattr(self, name, additional_saves)
 
+    def _save_parent_fields(self, field_names):
+        """
+        Write the given fields of the super form's instance to the database.
+        Only these fields are updated if the instance exists already.
+        """
+        if not field_names:
+            return
+        if self.instance.pk is not None and not self.instance._state.adding:
+            self.instance.save(update_fields=field_names)
+        else:
+            self.instance.save()
+
     def save_form(self, commit=True):
         """
         This calls Django's ``ModelForm.save()``. It only takes care of
@@ -343,19 +851,118 @@ class SuperModelFormMixin(SuperFormMixin):
         We separate this out of the
         :meth:`~django_superform.forms.SuperModelForm.save` method to make
         extensibility easier.
+
+        With ``partial_update`` only the changed fields of an existing
+        instance are written.
+
+        With ``skip_unchanged`` the instance is not written if it exists
+        already, none of the form's own fields changed and no nested form
+        that is saved before it creates a new object the instance refers to.
+        """
+        if commit and self._can_skip_save_form():
+            return self.instance
+        save = super(SuperModelFormMixin, self).save
+        if commit and self.partial_update:
+            changed_data = list(self._own_changed_data())
+            if getattr(self, "_saved_before_parent_changes_parent", False):
+                # Nested forms that were saved first created new objects that
+                # the instance refers to.
+                for name in self._saved_before_parent:
+                    field = self.composite_fields.lookup(name)
+                    changed_data.extend(field.get_parent_fields(self, name))
+            return save_changed_fields(self, changed_data, save=save)
+        return save(commit=commit)
+
+    def _can_skip_save_form(self):
+        if not self.skip_unchanged:
+            return False
+        instance = self.instance
+        if instance.pk is None or instance._state.adding:
+            return False
+        if self._own_changed_data():
+            return False
+        saved_before_parent = getattr(self, "_saved_before_parent", ())
+        if saved_before_parent and self._saved_before_parent_changes_parent:
+            return False
+        for name in self.forms:
+            if name in saved_before_parent:
+                continue
+            entry = self._get_plan_entry(name)
+            if entry.savable and entry.save_before_parent:
+                if entry.field.changes_parent(self, name, self.forms[name]):
+                    return False
+        return True
+
+    def save_forms_before_parent(self):
+        """
+        Save the nested forms that need to be saved before the super form's
+        instance, e.g. the ones of
+        :class:`~django_superform.fields.ForeignKeyFormField`. Their objects
+        are assigned to the super form's instance but it is not saved.
         """
-        return super(SuperModelFormMixin, self).save(commit=commit)
+        saved = []
+        changes_parent = False
+        for name in self.forms:
+            entry = self._get_plan_entry(name)
+            if entry.savable and entry.save_before_parent:
+                composite = self.forms[name]
+                track_changes = self.skip_unchanged or self.partial_update
+                if track_changes and not changes_parent:
+                    changes_parent = entry.field.changes_parent(self, name, composite)
+                self._save_composite(entry.field, name, composite, True)
+                saved.append(name)
+        self._saved_before_parent = tuple(saved)
+        self._saved_before_parent_changes_parent = changes_parent
 
     def save_forms(self, commit=True):
+        """
+        Save all nested forms that were not already saved by
+        :meth:`save_forms_before_parent`. If ``commit=False``, it will modify
+        the form's ``save_m2m()`` so that it also calls the nested forms'
+        ``save_m2m()`` methods.
+        """
         saved_composites = []
-        for name, composite in self.forms.items():
-            field = self.composite_fields[name]
-            if hasattr(field, "save"):
-                field.save(self, name, composite, commit=commit)
-                saved_composites.append(composite)
-
+        parent_fields = []
+        deferred = []
+        saved_before_parent = getattr(self, "_saved_before_parent", ())
+        for name in self.forms:
+            if name in saved_before_parent:
+                continue
+            entry = self._get_plan_entry(name)
+            if not entry.savable:
+                continue
+            composite = self.forms[name]
+            if entry.save_before_parent:
+                # The super form's instance is already saved (or not saved at
+                # all with commit=False). Collect the references so that the
+                # instance is written only once.
+                if commit:
+                    self._save_composite(entry.field, name, composite, True)
+                    parent_fields.extend(entry.field.get_parent_fields(self, name))
+                else:
+                    deferred.append((entry.field, name, composite))
+                continue
+            self._save_composite(entry.field, name, composite, commit)
+            saved_composites.append(composite)
+
+        self._save_parent_fields(parent_fields)
         self._extend_save_m2m("save_forms_m2m", saved_composites)
 
+        if deferred:
+
+            def save_deferred_forms():
+                deferred_fields = []
+                for field, name, composite in deferred:
+                    changes_parent = not self.skip_unchanged or field.changes_parent(
+                        self, name, composite
+                    )
+                    self._save_composite(field, name, composite, True)
+                    if changes_parent:
+                        deferred_fields.extend(field.get_parent_fields(self, name))
+                self._save_parent_fields(deferred_fields)
+
+            self._chain_save_m2m("save_forms_before_parent_m2m", [save_deferred_forms])
+
     def save_formsets(self, commit=True):
         """
         Save all formsets. If ``commit=False``, it will modify the form's
@@ -363,10 +970,11 @@ class SuperModelFormMixin(SuperFormMixin):
         methods.
         """
         saved_composites = []
-        for name, composite in self.formsets.items():
-            field = self.composite_fields[name]
-            if hasattr(field, "save"):
-                field.save(self, name, composite, commit=commit)
+        for name in self.formsets:
+            entry = self._get_plan_entry(name)
+            if entry.savable:
+                composite = self.formsets[name]
+                self._save_composite(entry.field, name, composite, commit)
                 saved_composites.append(composite)
 
         self._extend_save_m2m("save_formsets_m2m", saved_composites)
@@ -0,0 +1,349 @@
+"""
+Instrumentation of super forms. It reports how long the composite fields of
+a super form take to initialize, clean, save and render, how often that
+happens and how many database queries are issued while doing so.
+
+Every measurement is reported to a collector together with the path of the
+composite field in the form tree, like ``address`` or ``comments.3.tags``
+(the ``tags`` field of the fourth form in the ``comments`` formset), and the
+phase (``init``, ``clean``, ``save`` or ``render``).
+
+By default the :class:`NullCollector` is used, which disables the
+instrumentation. Install another collector globally with
+:func:`set_collector` or for a block of code in the current thread with
+:func:`use_collector`::
+
+    from django_superform.instrumentation import MemoryCollector, use_collector
+
+    collector = MemoryCollector()
+    with use_collector(collector):
+        form = PostForm(request.POST)
+        if form.is_valid():
+            form.save()
+    print(collector.stats())
+"""
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import connections
+
+try:
+    timer = time.perf_counter
+except AttributeError:
+    timer = time.time
+
+
+_local = threading.local()
+
+
+class BaseCollector(object):
+    """
+    Base class for collectors. Subclasses need to implement :meth:`record`.
+    """
+
+    #: Whether measurements are taken at all.
+    enabled = True
+    #: Whether database queries are counted.
+    count_queries = True
+
+    def sample(self):
+        """
+        Called once for every super form that is not nested in another one.
+        Return ``False`` to skip the instrumentation of that form tree.
+        """
+        return True
+
+    def record(self, path, phase, duration, queries):
+        """
+        Record a single measurement. ``duration`` is given in seconds,
+        ``queries`` is the number of database queries or ``None`` if queries
+        are not counted.
+        """
+        raise NotImplementedError
+
+
+class NullCollector(BaseCollector):
+    """
+    The default collector. It disables instrumentation entirely.
+    """
+
+    enabled = False
+
+    def record(self, path, phase, duration, queries):
+        pass
+
+
+class MemoryCollector(BaseCollector):
+    """
+    Aggregates the measurements in memory. :meth:`stats` returns a dict that
+    maps ``(path, phase)`` tuples to dicts with the number of ``calls``, the
+    total ``time`` in seconds and the total number of ``queries``.
+    """
+
+    def __init__(self, count_queries=True):
+        self.count_queries = count_queries
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, path, phase, duration, queries):
+        with self._lock:
+            stats = self._stats.setdefault(
+                (path, phase), {"calls": 0, "time": 0.0, "queries": 0}
+            )
+            stats["calls"] += 1
+            stats["time"] += duration
+            if queries:
+                stats["queries"] += queries
+
+    def stats(self):
+        with self._lock:
+            return dict((key, dict(value)) for key, value in self._stats.items())
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class LoggingCollector(BaseCollector):
+    """
+    Logs every measurement to the ``django_superform.instrumentation`` logger
+    (or the given ``logger``). Set ``sample_rate`` to a value between ``0``
+    and ``1`` to instrument only that fraction of the form trees.
+    """
+
+    def __init__(self, logger=None, level=logging.INFO, sample_rate=1.0, count_queries=True):
+        if logger is None:
+            logger = logging.getLogger(__name__)
+        self.logger = logger
+        self.level = level
+        self.sample_rate = sample_rate
+        self.count_queries = count_queries
+
+    def sample(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def record(self, path, phase, duration, queries):
+        self.logger.log(
+            self.level,
+            "superform %s %s: %.3fms, %s queries",
+            phase,
+            path,
+            duration * 1000,
+            "-" if queries is None else queries,
+        )
+
+
+_default_collector = NullCollector()
+
+
+def get_collector():
+    """
+    Return the collector that is active in the current thread.
+    """
+    collector = getattr(_local, "collector", None)
+    if collector is None:
+        return _default_collector
+    return collector
+
+
+def set_collector(collector):
+    """
+    Install ``collector`` globally. Pass ``None`` to restore the
+    :class:`NullCollector`.
+    """
+    global _default_collector
+    if collector is None:
+        collector = NullCollector()
+    _default_collector = collector
+
+
+@contextmanager
+def use_collector(collector):
+    """
+    Use ``collector`` in the current thread while the block is executed.
+    """
+    previous = getattr(_local, "collector", None)
+    _local.collector = collector
+    try:
+        yield collector
+    finally:
+        _local.collector = previous
+
+
+class _Frame(object):
+    """
+    The instrumentation state of a single super form: the collector, the
+    path of the form in the form tree and whether the tree is sampled.
+    """
+
+    __slots__ = ("collector", "path", "sampled")
+
+    def __init__(self, collector, path, sampled):
+        self.collector = collector
+        self.path = path
+        self.sampled = sampled
+
+    def join(self, name):
+        if self.path:
+            return self.path + "." + name
+        return name
+
+
+def _get_stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def get_stack():
+    """
+    Return a copy of the stack of composite fields that are currently
+    processed in this thread. Pass it to :func:`restore_stack` in a worker
+    thread so that forms created there get the right path.
+    """
+    return list(_get_stack())
+
+
+@contextmanager
+def restore_stack(stack):
+    previous = getattr(_local, "stack", None)
+    _local.stack = list(stack)
+    try:
+        yield
+    finally:
+        _local.stack = previous
+
+
+def bind(form):
+    """
+    Return the instrumentation frame for the super form ``form`` or ``None``
+    if the form is not instrumented.
+
+    The path of a nested form is derived from the composite field that is
+    processed when the form is created. Forms inside a formset get the index
+    of the form appended to the formset's path.
+    """
+    stack = _get_stack()
+    if stack:
+        parent_frame, path, prefix = stack[-1]
+        form_prefix = form.prefix or ""
+        if form_prefix != prefix and form_prefix.startswith(prefix + "-"):
+            path = path + "." + form_prefix[len(prefix) + 1:]
+        return _Frame(parent_frame.collector, path, parent_frame.sampled)
+
+    collector = get_collector()
+    if not collector.enabled:
+        return None
+    # Forms of a tree that is not sampled still get a frame, so that the
+    # nested forms know that they are not sampled either.
+    return _Frame(collector, "", collector.sample())
+
+
+def bind_formset(form, name, formset, field):
+    """
+    Make sure that the forms of ``formset``, the formset of the composite
+    field ``name`` of the super form ``form``, get the formset's path even if
+    they are built later outside of a measured block, e.g. when the formset
+    is iterated in a template.
+    """
+    frame = getattr(form, "_instrumentation", None)
+    if frame is None:
+        return
+    entry = (frame, frame.join(name), field.get_prefix(form, name))
+    construct_form = formset._construct_form
+
+    def _construct_form(i, **kwargs):
+        stack = _get_stack()
+        stack.append(entry)
+        try:
+            return construct_form(i, **kwargs)
+        finally:
+            stack.pop()
+
+    formset._construct_form = _construct_form
+
+
+def _count_queries():
+    count = 0
+    for connection in connections.all():
+        if hasattr(connection, "queries_log"):
+            count += len(connection.queries_log)
+        else:
+            # Django < 1.8
+            count += len(connection.queries)
+    return count
+
+
+def _debug_cursor_attribute(connection):
+    if hasattr(connection, "force_debug_cursor"):
+        return "force_debug_cursor"
+    # Django < 1.8
+    return "use_debug_cursor"
+
+
+class _Measurement(object):
+    def __init__(self, frame, form, name, phase, field):
+        self.frame = frame
+        self.path = frame.join(name)
+        self.phase = phase
+        self.prefix = field.get_prefix(form, name) if field is not None else ""
+
+    def __enter__(self):
+        collector = self.frame.collector
+        _get_stack().append((self.frame, self.path, self.prefix))
+        if not self.frame.sampled:
+            return self
+        self.debug_cursors = None
+        if collector.count_queries:
+            self.debug_cursors = []
+            for connection in connections.all():
+                attribute = _debug_cursor_attribute(connection)
+                self.debug_cursors.append(
+                    (connection, attribute, getattr(connection, attribute))
+                )
+                setattr(connection, attribute, True)
+            self.queries = _count_queries()
+        self.start = timer()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self.frame.sampled:
+            _get_stack().pop()
+            return False
+        duration = timer() - self.start
+        queries = None
+        if self.debug_cursors is not None:
+            queries = _count_queries() - self.queries
+            for connection, attribute, debug_cursor in self.debug_cursors:
+                setattr(connection, attribute, debug_cursor)
+        _get_stack().pop()
+        self.frame.collector.record(self.path, self.phase, duration, queries)
+        return False
+
+
+class _NoMeasurement(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_no_measurement = _NoMeasurement()
+
+
+def measure(form, name, phase, field=None):
+    """
+    Return a context manager that measures the ``phase`` of the composite
+    field ``name`` of the super form ``form``. The prefix of ``field`` is
+    used to determine the path of super forms that are created while the
+    block is executed.
+    """
+    frame = getattr(form, "_instrumentation", None)
+    if frame is None:
+        return _no_measurement
+    return _Measurement(frame, form, name, phase, field)
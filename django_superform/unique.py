@@ -0,0 +1,168 @@
+"""
+Batched unique validation for model formsets.
+
+Django validates the unique constraints of every form of a model formset
+separately, with one query per constraint and form. :class:`BatchUniqueValidation`
+collects the values of all forms instead and checks each constraint with a
+single query when the formset is cleaned. The errors are attached to the
+forms in the same way as Django does it.
+"""
+import functools
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import connections
+
+
+class BatchUniqueValidation(object):
+    """
+    Installs the batched unique validation on ``formset``. The forms'
+    ``validate_unique`` only collects the unique checks, which are performed
+    at the beginning of the formset's ``clean()``. Checks of
+    ``unique_for_date`` and similar options are still performed per form.
+    """
+
+    def __init__(self, formset):
+        self.formset = formset
+        self.pending = []
+
+    def install(self):
+        formset = self.formset
+        construct_form = formset._construct_form
+        clean = formset.clean
+
+        def _construct_form(i, **kwargs):
+            form = construct_form(i, **kwargs)
+            form.validate_unique = functools.partial(self.collect, form)
+            return form
+
+        def batched_clean():
+            self.validate()
+            return clean()
+
+        formset._construct_form = _construct_form
+        formset.clean = batched_clean
+        return self
+
+    def collect(self, form):
+        """
+        Replaces ``form.validate_unique()``. The checks that need a query are
+        remembered for :meth:`validate`.
+        """
+        exclude = form._get_validation_exclusions()
+        unique_checks, date_checks = form.instance._get_unique_checks(exclude=exclude)
+        date_errors = form.instance._perform_date_checks(date_checks)
+        self.pending.append((form, unique_checks, date_errors))
+
+    def validate(self):
+        """
+        Perform the collected unique checks with one query per constraint and
+        add the errors to the forms.
+        """
+        pending, self.pending = self.pending, []
+        checks = {}
+        for form, unique_checks, date_errors in pending:
+            for model_class, unique_check in unique_checks:
+                lookup = self.get_lookup(form.instance, model_class, unique_check)
+                if lookup is not None:
+                    checks.setdefault((model_class, tuple(unique_check)), []).append(
+                        (form, lookup)
+                    )
+
+        errors = dict((form, {}) for form, unique_checks, date_errors in pending)
+        for (model_class, unique_check), candidates in checks.items():
+            for form in self.find_conflicts(model_class, unique_check, candidates):
+                key = unique_check[0] if len(unique_check) == 1 else NON_FIELD_ERRORS
+                errors[form].setdefault(key, []).append(
+                    form.instance.unique_error_message(model_class, unique_check)
+                )
+
+        for form, unique_checks, date_errors in pending:
+            form_errors = errors[form]
+            for key, messages in date_errors.items():
+                form_errors.setdefault(key, []).extend(messages)
+            if form_errors:
+                form._update_errors(ValidationError(form_errors))
+
+    def get_lookup(self, instance, model_class, unique_check):
+        """
+        Return the lookup values of ``instance`` for ``unique_check`` or
+        ``None`` if the check is skipped, like ``Model._perform_unique_checks``
+        does.
+        """
+        connection = connections[model_class._default_manager.db]
+        values = []
+        for field_name in unique_check:
+            field = instance._meta.get_field(field_name)
+            value = getattr(instance, field.attname)
+            if value is None or (
+                value == "" and connection.features.interprets_empty_strings_as_nulls
+            ):
+                return None
+            if field.primary_key and not instance._state.adding:
+                return None
+            values.append(value)
+        return tuple(values)
+
+    def find_conflicts(self, model_class, unique_check, candidates):
+        """
+        Return the forms of ``candidates`` whose values exist in the database
+        for another object.
+        """
+        try:
+            existing = self.get_existing(model_class, unique_check, candidates)
+        except TypeError:
+            # Values that cannot be hashed.
+            existing = None
+        if existing is None:
+            return self.find_conflicts_per_form(model_class, unique_check, candidates)
+
+        conflicts = []
+        for form, lookup in candidates:
+            pks = existing.get(lookup, ())
+            own_pk = self.get_own_pk(form.instance, model_class)
+            if any(pk != own_pk for pk in pks):
+                conflicts.append(form)
+        return conflicts
+
+    def get_existing(self, model_class, unique_check, candidates):
+        """
+        Return a dict that maps the existing values of ``unique_check`` to
+        the primary keys of the objects that have them, or ``None`` if the
+        database matched a value of any column that differs in Python, e.g.
+        because of a case insensitive collation.
+        """
+        lookups = set(lookup for form, lookup in candidates)
+        columns = [
+            set(lookup[i] for lookup in lookups) for i in range(len(unique_check))
+        ]
+        filters = {}
+        for field_name, values in zip(unique_check, columns):
+            filters["%s__in" % field_name] = list(values)
+        rows = model_class._default_manager.filter(**filters).values_list(
+            "pk", *unique_check
+        )
+        existing = {}
+        for row in rows:
+            key = tuple(row[1:])
+            if any(value not in values for value, values in zip(key, columns)):
+                return None
+            existing.setdefault(key, set()).add(row[0])
+        return existing
+
+    def find_conflicts_per_form(self, model_class, unique_check, candidates):
+        conflicts = []
+        for form, lookup in candidates:
+            queryset = model_class._default_manager.filter(
+                **dict(zip(unique_check, lookup))
+            )
+            own_pk = self.get_own_pk(form.instance, model_class)
+            if own_pk is not None:
+                queryset = queryset.exclude(pk=own_pk)
+            if queryset.exists():
+                conflicts.append(form)
+        return conflicts
+
+    def get_own_pk(self, instance, model_class):
+        if instance._state.adding:
+            return None
+        return instance._get_pk_val(model_class._meta)
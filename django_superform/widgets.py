@@ -1,5 +1,223 @@
+import hashlib
+import os
+
+import django
 from django import forms
-from django.template import loader
+from django.conf import settings
+from django.template import TemplateDoesNotExist, loader
+from django.utils import six, translation
+from django.utils.encoding import force_bytes, force_text
+from django.utils.functional import cached_property
+from django.utils.safestring import mark_safe
+
+try:
+    from django.test.signals import setting_changed
+except ImportError:
+    setting_changed = None
+
+try:
+    from django.core.cache import caches
+except ImportError:
+    from django.core.cache import get_cache
+    caches = None
+
+try:
+    from django.utils.module_loading import import_string
+except ImportError:
+    from django.utils.importlib import import_module
+
+    def import_string(dotted_path):
+        module_path, class_name = dotted_path.rsplit(".", 1)
+        return getattr(import_module(module_path), class_name)
+
+
+# Maps ``(engine, template_name)`` to the compiled template.
+_template_cache = {}
+
+
+def get_template(template_name, renderer=None):
+    """
+    Return the compiled template for ``template_name``. It is loaded with the
+    form ``renderer`` if given (Django 1.11+), otherwise with Django's
+    template loader.
+
+    Templates are cached per engine and template name. In ``DEBUG`` mode the
+    cache is bypassed, so that changes to the templates are picked up.
+    """
+    engine = getattr(renderer, "engine", renderer)
+    key = (engine, template_name)
+    use_cache = not settings.DEBUG
+    if use_cache:
+        try:
+            return _template_cache[key]
+        except KeyError:
+            pass
+    if renderer is not None:
+        template = renderer.get_template(template_name)
+    else:
+        template = loader.get_template(template_name)
+    if use_cache:
+        _template_cache[key] = template
+    return template
+
+
+def clear_template_cache(**kwargs):
+    """
+    Empty the cache of compiled templates used by :func:`get_template`.
+    """
+    _template_cache.clear()
+
+
+def _setting_changed(setting, **kwargs):
+    if setting in ("TEMPLATES", "FORM_RENDERER", "DEBUG"):
+        clear_template_cache()
+
+
+if setting_changed is not None:
+    setting_changed.connect(_setting_changed)
+
+
+def _render_legacy(template_name, context, context_instance=None):
+    # Templates of Django < 1.8 are rendered with a ``Context`` instead of a
+    # dict, so they are rendered like before the template cache existed.
+    return loader.render_to_string(
+        template_name, dictionary=context, context_instance=context_instance
+    )
+
+
+class EngineRenderer(object):
+    """
+    Renders templates with a template engine of its own, independent of the
+    ``TEMPLATES`` setting. The engine loads templates from the ``DIRS`` and
+    the app directories of all installed apps. Subclasses set ``backend`` to
+    the dotted path of a Django template backend.
+
+    It provides the same ``get_template()`` and ``render()`` methods as the
+    form renderers of Django 1.11+, so it can be used on Django 1.8 to 1.10
+    as well. The template backends it relies on do not exist before Django
+    1.8.
+    """
+
+    backend = None
+    #: Additional template directories searched by the engine.
+    dirs = ()
+    options = {}
+
+    @cached_property
+    def engine(self):
+        backend_class = import_string(self.backend)
+        return backend_class({
+            "APP_DIRS": True,
+            "DIRS": list(self.dirs),
+            "NAME": "superform",
+            "OPTIONS": dict(self.options),
+        })
+
+    def get_template(self, template_name):
+        return self.engine.get_template(template_name)
+
+    def render(self, template_name, context, request=None):
+        template = self.get_template(template_name)
+        return template.render(context, request=request).strip()
+
+
+class DjangoTemplatesRenderer(EngineRenderer):
+    """
+    Renders with the Django template language. Templates are loaded from the
+    ``templates`` directory of the installed apps.
+    """
+
+    backend = "django.template.backends.django.DjangoTemplates"
+
+
+class Jinja2Renderer(EngineRenderer):
+    """
+    Renders with Jinja2. Templates are loaded from the ``jinja2`` directory
+    of the installed apps. django-superform ships Jinja2 versions of its
+    built-in templates.
+    """
+
+    backend = "django.template.backends.jinja2.Jinja2"
+
+
+def render_form(context):
+    """
+    Render ``superform/formfield.html`` without a template engine.
+    """
+    return mark_safe(force_text(context["value"]) + "\n")
+
+
+def render_formset(context):
+    """
+    Render ``superform/formsetfield.html`` without a template engine.
+    Forms render to safe HTML, but they do not provide ``__html__()`` on
+    Django < 1.8, so they are marked safe here.
+    """
+    formset = context["value"]
+    parts = [force_text(formset.management_form), "\n"]
+    for form in formset:
+        parts.append("\n    ")
+        parts.append(force_text(form))
+        parts.append("\n")
+    parts.append("\n")
+    return mark_safe("".join(parts))
+
+
+class PythonRenderer(object):
+    """
+    Renders the built-in templates with plain Python functions instead of a
+    template engine, which is considerably faster for formsets with many
+    forms. The output is the same as the one of the Django templates.
+
+    ``functions`` maps template names to functions that take the widget's
+    context and return the HTML. Other templates are rendered with Django's
+    template loader. Overridden versions of the built-in templates are not
+    used by this renderer.
+    """
+
+    functions = {
+        "superform/formfield.html": render_form,
+        "superform/formsetfield.html": render_formset,
+    }
+
+    def __call__(self, template_name, context, request=None):
+        try:
+            function = self.functions[template_name]
+        except KeyError:
+            if django.VERSION < (1, 8):
+                return _render_legacy(template_name, context)
+            template = get_template(template_name)
+            return template.render(context, request=request)
+        return function(context)
+
+
+#: Short names that can be given instead of a renderer.
+RENDERERS = {
+    "django": "django_superform.widgets.DjangoTemplatesRenderer",
+    "jinja2": "django_superform.widgets.Jinja2Renderer",
+    "python": "django_superform.widgets.PythonRenderer",
+}
+
+# Maps renderer classes to their shared instance. Renderers own a template
+# engine, which is expensive to set up and caches its compiled templates.
+_renderers = {}
+
+
+def get_renderer(renderer):
+    """
+    Return the renderer described by ``renderer``. It may be one of the
+    short names in :data:`RENDERERS`, the dotted path to a renderer class, a
+    renderer class, or a renderer instance or callable which is returned
+    unchanged. All widgets given the same class share one instance.
+    """
+    if isinstance(renderer, six.string_types):
+        renderer = import_string(RENDERERS.get(renderer, renderer))
+    if isinstance(renderer, type):
+        try:
+            return _renderers[renderer]
+        except KeyError:
+            return _renderers.setdefault(renderer, renderer())
+    return renderer
 
 
 class TemplateWidget(forms.Widget):
@@ -7,16 +225,45 @@ class TemplateWidget(forms.Widget):
     Template based widget. It renders the ``template_name`` set as attribute
     which can be overriden by the ``template_name`` argument to the
     ``__init__`` method.
+
+    The template is rendered with the form renderer that Django passes to
+    :meth:`render` (Django 1.11+) or Django's template loader. Set
+    ``renderer`` (as attribute or argument to ``__init__``) to render with a
+    different engine instead. It accepts everything :func:`get_renderer`
+    does, e.g. ``"jinja2"``. A plain callable is called as
+    ``renderer(template_name, context, request)`` and returns the HTML.
+
+    Set ``cache_alias`` to the name of a cache in the ``CACHES`` setting to
+    store the rendered HTML there, for ``cache_timeout`` seconds (the cache's
+    default if ``None``). Only values for which :meth:`is_cacheable` returns
+    ``True`` are cached, that is unbound forms and formsets that are not tied
+    to a saved model instance. The key contains the form class, the prefix,
+    the active language, the initial values and the widget's name and
+    attributes. Change ``cache_version`` to invalidate all entries, e.g.
+    after a deployment.
     """
 
     field = None
     template_name = None
     value_context_name = None
+    renderer = None
+    cache_alias = None
+    cache_timeout = None
+    cache_version = None
 
     def __init__(self, *args, **kwargs):
         template_name = kwargs.pop("template_name", None)
         if template_name is not None:
             self.template_name = template_name
+        renderer = kwargs.pop("renderer", None)
+        if renderer is not None:
+            self.renderer = renderer
+        if self.renderer is not None:
+            self.renderer = get_renderer(self.renderer)
+        for option in ("cache_alias", "cache_timeout", "cache_version"):
+            value = kwargs.pop(option, None)
+            if value is not None:
+                setattr(self, option, value)
         super(TemplateWidget, self).__init__(*args, **kwargs)
         self.context_instance = None
 
@@ -38,25 +285,244 @@ class TemplateWidget(forms.Widget):
             context["hidden"] = True
 
         context.update(self.get_context_data())
-        context["attrs"] = self.build_attrs(attrs)
+        if django.VERSION >= (1, 11):
+            context["attrs"] = self.build_attrs(self.attrs, attrs)
+        else:
+            context["attrs"] = self.build_attrs(attrs)
 
         return context
 
-    def render(self, name, value, attrs=None, **kwargs):
+    def get_template(self, template_name, renderer=None):
+        return get_template(template_name, renderer=renderer)
+
+    def is_cacheable(self, value):
+        """
+        Return ``True`` if the HTML for ``value`` is the same for every
+        request and can be stored in the fragment cache.
+        """
+        return False
+
+    def get_cache_key(self, template_name, name, value, attrs=None):
+        """
+        Return the fragment cache key for rendering ``value`` or ``None`` if
+        it must not be cached.
+        """
+        if self.cache_alias is None or not self.is_cacheable(value):
+            return None
+        value_class = type(value)
+        parts = [
+            "{0}.{1}".format(value_class.__module__, value_class.__name__),
+            getattr(value, "prefix", None),
+            translation.get_language(),
+            template_name,
+            type(self.renderer).__name__,
+            name,
+            sorted((attrs or {}).items()),
+        ]
+        parts.extend(self.get_cache_key_parts(value))
+        digest = hashlib.md5(force_bytes(repr(parts))).hexdigest()
+        return "superform.fragment.{0}".format(digest)
+
+    def get_cache_key_parts(self, value):
+        """
+        Return a list of additional values that the cached HTML depends on.
+        """
+        return []
+
+    def get_cache(self):
+        if caches is None:
+            return get_cache(self.cache_alias)
+        return caches[self.cache_alias]
+
+    def render(self, name, value, attrs=None, renderer=None, **kwargs):
         template_name = kwargs.pop("template_name", None)
         if template_name is None:
             template_name = self.template_name
+        cache_key = self.get_cache_key(template_name, name, value, attrs)
+        if cache_key is not None:
+            cache = self.get_cache()
+            html = cache.get(cache_key, version=self.cache_version)
+            if html is not None:
+                return mark_safe(html)
+        html = self._render(
+            template_name, name, value, attrs=attrs, renderer=renderer, **kwargs
+        )
+        if cache_key is not None:
+            cache.set(
+                cache_key,
+                six.text_type(html),
+                self.cache_timeout,
+                version=self.cache_version,
+            )
+        return html
+
+    def _render(self, template_name, name, value, attrs=None, renderer=None,
+                **kwargs):
         context = self.get_context(name, value, attrs=attrs or {}, **kwargs)
-        return loader.render_to_string(
-            template_name, dictionary=context, context_instance=self.context_instance
+        request = getattr(self.context_instance, "request", None)
+        if self.renderer is not None:
+            renderer = self.renderer
+            if not hasattr(renderer, "get_template"):
+                return mark_safe(renderer(template_name, context, request))
+        elif django.VERSION < (1, 8):
+            return _render_legacy(template_name, context, self.context_instance)
+        template = self.get_template(template_name, renderer=renderer)
+        return template.render(context, request=request)
+
+    def can_stream(self, renderer=None):
+        """
+        Return ``True`` if the widget renders the built-in template with
+        the ``PythonRenderer`` or with the Django template language, and the
+        template is not overridden by the project. Only then :meth:`stream`
+        can emulate the template. ``renderer`` is the form renderer that is
+        passed to :meth:`render`.
+        """
+        if self.template_name not in PythonRenderer.functions:
+            return False
+        if isinstance(self.renderer, PythonRenderer):
+            return True
+        if self.renderer is not None:
+            if not isinstance(self.renderer, DjangoTemplatesRenderer):
+                return False
+            renderer = self.renderer
+        template = self.get_template(self.template_name, renderer=renderer)
+        return _is_builtin_template(template, self.template_name, renderer)
+
+    def stream(self, name, value, attrs=None, renderer=None):
+        """
+        Yield the rendered HTML in chunks. The concatenated chunks are the
+        output of :meth:`render`. By default the whole output is a single
+        chunk, ``FormSetWidget`` yields one chunk per form.
+        """
+        yield self.render(name, value, attrs=attrs, renderer=renderer)
+
+
+_template_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+
+def _is_builtin_template(template, template_name, renderer=None):
+    """
+    Return ``True`` if ``template`` was loaded from the templates directory
+    of this package.
+    """
+    template = getattr(template, "template", template)
+    origin = getattr(template, "origin", None)
+    path = getattr(origin, "name", None)
+    if not path:
+        # Django < 1.9 only sets the origin when debugging templates. Then
+        # the template has to be the one the loaders find for the name.
+        if getattr(template, "name", None) != template_name:
+            return False
+        path = _find_template_path(template_name, renderer)
+        if not path:
+            return False
+    builtin = os.path.join(_template_dir, *template_name.split("/"))
+    return os.path.normcase(os.path.abspath(path)) == os.path.normcase(builtin)
+
+
+def _find_template_path(template_name, renderer=None):
+    """
+    Return the path of the file that the template loaders of Django < 1.9
+    find for ``template_name``, or ``None``.
+    """
+    engine = getattr(getattr(renderer, "engine", None), "engine", None)
+    if engine is None:
+        try:
+            from django.template.engine import Engine
+        except ImportError:
+            if loader.template_source_loaders is None:
+                loader.find_template(template_name)
+            template_loaders = loader.template_source_loaders
+        else:
+            engine = Engine.get_default()
+    if engine is not None:
+        template_loaders = engine.template_loaders
+    pending = list(template_loaders)
+    while pending:
+        template_loader = pending.pop(0)
+        if hasattr(template_loader, "loaders"):
+            # The cached loader delegates to other loaders.
+            pending[:0] = template_loader.loaders
+            continue
+        try:
+            source, path = template_loader.load_template_source(template_name)
+        except (AttributeError, TemplateDoesNotExist):
+            continue
+        return path
+    return None
+
+
+def _is_unsaved(instance):
+    return instance is None or instance.pk is None
+
+
+def _freeze(value):
+    """
+    Return a representation of the initial data ``value`` for cache keys.
+    Model instances are represented by their class and primary key.
+    """
+    if isinstance(value, dict):
+        return sorted(
+            ((key, _freeze(item)) for key, item in value.items()),
+            key=lambda item: item[0],
         )
+    if isinstance(value, (list, tuple)):
+        return [_freeze(item) for item in value]
+    if hasattr(value, "_meta") and hasattr(value, "pk"):
+        value_class = type(value)
+        return (value_class.__module__, value_class.__name__, value.pk)
+    return value
 
 
 class FormWidget(TemplateWidget):
     template_name = "superform/formfield.html"
     value_context_name = "form"
 
+    def is_cacheable(self, value):
+        return not value.is_bound and _is_unsaved(getattr(value, "instance", None))
+
+    def get_cache_key_parts(self, value):
+        return [_freeze(value.initial)]
+
 
 class FormSetWidget(TemplateWidget):
     template_name = "superform/formsetfield.html"
     value_context_name = "formset"
+
+    def is_cacheable(self, value):
+        if value.is_bound:
+            return False
+        if hasattr(value, "get_queryset"):
+            # Model formsets render the objects in their queryset. Only the
+            # queryset of an inline formset for an unsaved instance is known
+            # to be empty.
+            return hasattr(value, "fk") and _is_unsaved(value.instance)
+        return True
+
+    def get_cache_key_parts(self, value):
+        form_class = value.form
+        return [
+            "{0}.{1}".format(form_class.__module__, form_class.__name__),
+            value.total_form_count(),
+            value.min_num,
+            value.max_num,
+            value.can_order,
+            value.can_delete,
+            _freeze(value.initial),
+            _freeze(getattr(value, "initial_extra", None)),
+            _freeze(getattr(value, "form_kwargs", None)),
+        ]
+
+    def stream(self, name, value, attrs=None, renderer=None):
+        cache_key = self.get_cache_key(self.template_name, name, value, attrs)
+        if cache_key is not None or not self.can_stream(renderer):
+            for chunk in super(FormSetWidget, self).stream(
+                name, value, attrs=attrs, renderer=renderer
+            ):
+                yield chunk
+            return
+        # Emulates superform/formsetfield.html, see ``render_formset``.
+        yield mark_safe(force_text(value.management_form) + "\n")
+        for form in value:
+            yield mark_safe("\n    " + force_text(form) + "\n")
+        yield mark_safe("\n")
@@ -25,7 +25,7 @@ setup(
     version=find_version("django_superform", "__init__.py"),
     author="Gregor Müllegger",
     author_email="gregor@muellegger.de",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks"]),
     include_package_data=True,
     url="https://github.com/jazzband/django-superform",
     license="BSD licence, see LICENSE file",
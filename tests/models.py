@@ -29,3 +29,24 @@ class Image(models.Model):
 
     class Meta:
         ordering = ("position",)
+
+
+class Tag(models.Model):
+    post = models.ForeignKey("Post", related_name="tags")
+
+    name = models.CharField(max_length=50, unique=True)
+    position = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ("position",)
+        unique_together = ("post", "position")
+
+
+class Review(models.Model):
+    """
+    A review of a post, which might also refer to the series.
+    """
+
+    post = models.ForeignKey("Post", null=True, blank=True)
+    series = models.ForeignKey("Series", null=True, blank=True)
+    text = models.CharField(max_length=50)
@@ -0,0 +1,34 @@
+from django.test import TestCase
+
+from benchmarks.runner import compare_to_baseline, format_results, run_scenario
+from benchmarks.scenarios import Scenario
+
+
+class BenchmarkTests(TestCase):
+    def test_scenarios_produce_equivalent_forms(self):
+        for model in (False, True):
+            scenario = Scenario(depth=2, fields=2, formset_size=3, model=model)
+            data = scenario.get_data()
+            superform = scenario.build_superform(data)
+            manual = scenario.build_manual(data)
+            self.assertTrue(superform.is_valid(), superform.errors)
+            self.assertTrue(manual.is_valid())
+            self.assertEqual(len(superform.formsets["rows"].forms), 3)
+
+    def test_run_scenario(self):
+        scenario = Scenario(depth=1, fields=1, formset_size=2, model=True)
+        results = run_scenario(scenario, repeat=1)
+        self.assertEqual(
+            sorted(results.keys()),
+            [
+                "model-depth1-fields1-rows2/clean",
+                "model-depth1-fields1-rows2/init",
+                "model-depth1-fields1-rows2/media",
+                "model-depth1-fields1-rows2/render",
+                "model-depth1-fields1-rows2/save",
+            ],
+        )
+        save = results["model-depth1-fields1-rows2/save"]
+        self.assertEqual(save["superform"]["queries"], save["manual"]["queries"])
+        self.assertIn("model-depth1-fields1-rows2/init", format_results(results))
+        self.assertEqual(compare_to_baseline(results, results, 1.25), [])
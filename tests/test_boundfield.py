@@ -107,3 +107,28 @@ class CompositeBoundFieldTests(TestCase):
         # requirement.
         with self.assertRaises(TypeError):
             composite_bf["name"]
+
+    def test_it_is_created_once_per_form(self):
+        form = AccountForm()
+        bf = form["nested_form"]
+        self.assertIs(form["nested_form"], bf)
+        self.assertIsNot(AccountForm()["nested_form"], bf)
+
+    def test_add_composite_field_replaces_cached_bound_field(self):
+        form = AccountForm()
+        bf = form["nested_form"]
+        form.add_composite_field("nested_form", FormField(EmailForm))
+        new_bf = form["nested_form"]
+        self.assertIsNot(new_bf, bf)
+        self.assertIsInstance(new_bf.field.form_class(), EmailForm)
+
+    def test_it_uses_the_instance_copy_of_the_field(self):
+        form = AccountForm()
+        form["nested_form"]
+        field = form.composite_fields["nested_form"]
+        self.assertIs(form["nested_form"].field, field)
+        self.assertIs(form["nested_form"], form["nested_form"])
+
+        field = FormField(EmailForm)
+        form.composite_fields["nested_form"] = field
+        self.assertIs(form["nested_form"].field, field)
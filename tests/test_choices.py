@@ -0,0 +1,129 @@
+from django import forms
+from django.forms.formsets import formset_factory
+from django.test import TestCase
+from django_superform import (
+    FormSetField,
+    InlineFormSetField,
+    SuperForm,
+    SuperModelForm,
+)
+
+from .models import Image, Post, Series
+
+
+class ChoiceForm(forms.Form):
+    series = forms.ModelChoiceField(queryset=Series.objects.all())
+    other = forms.ModelMultipleChoiceField(
+        queryset=Series.objects.all(), required=False
+    )
+
+
+ChoiceFormSet = formset_factory(ChoiceForm, extra=0)
+
+
+class CachedChoicesForm(SuperForm):
+    rows = FormSetField(ChoiceFormSet, cache_choices=True)
+
+
+class UncachedChoicesForm(SuperForm):
+    rows = FormSetField(ChoiceFormSet)
+
+
+class CachedChoicesPostForm(SuperModelForm):
+    images = InlineFormSetField(
+        Post, Image, fields=["name"], extra=0, cache_choices=True
+    )
+
+    class Meta:
+        model = Post
+        fields = ["title"]
+
+
+class ChoiceCacheTests(TestCase):
+    def setUp(self):
+        self.series = [
+            Series.objects.create(title="Series %d" % i) for i in range(3)
+        ]
+
+    def get_data(self, values, other=()):
+        data = {
+            "formset-rows-TOTAL_FORMS": str(len(values)),
+            "formset-rows-INITIAL_FORMS": "0",
+        }
+        for i, value in enumerate(values):
+            data["formset-rows-%d-series" % i] = value
+            data["formset-rows-%d-other" % i] = list(other)
+        return data
+
+    def render_rows(self, form):
+        return [
+            str(row["series"]) + str(row["other"])
+            for row in form.formsets["rows"]
+        ]
+
+    def test_choices_are_queried_once(self):
+        initial = [{"series": s.pk} for s in self.series]
+        with self.assertNumQueries(1):
+            form = CachedChoicesForm(initial={"rows": initial})
+            cached = self.render_rows(form)
+        with self.assertNumQueries(6):
+            uncached = self.render_rows(
+                UncachedChoicesForm(initial={"rows": initial})
+            )
+        self.assertEqual(cached, uncached)
+
+    def test_forms_are_built_on_first_use(self):
+        initial = [{"series": self.series[0].pk}]
+        with self.assertNumQueries(0):
+            form = CachedChoicesForm(initial={"rows": initial})
+        self.assertNotIn("forms", form.formsets["rows"].__dict__)
+
+    def test_class_queryset_is_not_evaluated(self):
+        initial = [{"series": self.series[0].pk}]
+        self.render_rows(CachedChoicesForm(initial={"rows": initial}))
+        self.assertIsNone(ChoiceForm.base_fields["series"].queryset._result_cache)
+        series = Series.objects.create(title="New series")
+        rows = self.render_rows(CachedChoicesForm(initial={"rows": initial}))
+        self.assertIn('value="%d"' % series.pk, rows[0])
+
+    def test_values_are_validated_with_cache(self):
+        pks = [str(s.pk) for s in self.series]
+        with self.assertNumQueries(1):
+            form = CachedChoicesForm(self.get_data(pks + pks[:1]))
+            self.assertTrue(form.is_valid(), form.errors)
+        rows = form.formsets["rows"].cleaned_data
+        self.assertEqual([row["series"] for row in rows], self.series + self.series[:1])
+        # Every form gets its own object.
+        self.assertIsNot(rows[0]["series"], rows[3]["series"])
+
+    def test_invalid_values_have_same_errors(self):
+        data = self.get_data(["0", "abc"])
+        cached = CachedChoicesForm(data)
+        uncached = UncachedChoicesForm(data)
+        self.assertFalse(cached.is_valid())
+        self.assertFalse(uncached.is_valid())
+        self.assertEqual(cached.formsets["rows"].errors,
+                         uncached.formsets["rows"].errors)
+
+    def test_multiple_choices(self):
+        other = [str(self.series[0].pk), str(self.series[2].pk)]
+        form = CachedChoicesForm(self.get_data([str(self.series[1].pk)], other))
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid(), form.errors)
+        cleaned = form.formsets["rows"].cleaned_data[0]["other"]
+        self.assertEqual(
+            sorted(s.pk for s in cleaned), [self.series[0].pk, self.series[2].pk]
+        )
+
+    def test_primary_key_field_is_not_cached(self):
+        post = Post.objects.create(title="Post")
+        post.images.create(name="Image", image_url="http://example.com/")
+        other_post = Post.objects.create(title="Other post")
+        for i in range(10):
+            other_post.images.create(name="Other", image_url="http://example.com/")
+        # Only the query for the post's images, the image table is not
+        # loaded for the choices of the hidden ``id`` field.
+        with self.assertNumQueries(1):
+            form = CachedChoicesPostForm(instance=post)
+            forms = form.formsets["images"].forms
+        self.assertFalse(hasattr(forms[0].fields["id"], "_cached_choices_lookup"))
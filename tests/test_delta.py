@@ -0,0 +1,87 @@
+from django.test import TestCase
+from django_superform import InlineFormSetField, SuperModelForm
+
+from .models import Post, Tag
+
+
+class DeltaPostForm(SuperModelForm):
+    tags = InlineFormSetField(
+        Post, Tag, fields=["name", "position"], extra=0, can_delete=True,
+        delta=True
+    )
+
+    class Meta:
+        model = Post
+        fields = ["title"]
+
+
+class DeltaSubmissionTests(TestCase):
+    def setUp(self):
+        self.post = Post.objects.create(title="Post")
+        self.tags = [
+            self.post.tags.create(name="tag%d" % i, position=i) for i in range(5)
+        ]
+        self.other_post = Post.objects.create(title="Other post")
+        self.other_tag = self.other_post.tags.create(name="other", position=0)
+
+    def get_data(self, existing_rows=(), new_rows=()):
+        data = {
+            "title": "Post",
+            "formset-tags-INITIAL_FORMS": len(existing_rows),
+            "formset-tags-TOTAL_FORMS": len(existing_rows) + len(new_rows),
+        }
+        rows = list(existing_rows)
+        rows.extend((None, name, position, False) for name, position in new_rows)
+        for i, (pk, name, position, delete) in enumerate(rows):
+            if pk is not None:
+                data["formset-tags-%d-id" % i] = pk
+            data["formset-tags-%d-post" % i] = self.post.pk
+            data["formset-tags-%d-name" % i] = name
+            data["formset-tags-%d-position" % i] = position
+            if delete:
+                data["formset-tags-%d-DELETE" % i] = "on"
+        return data
+
+    def test_unbound_formset_contains_all_rows(self):
+        form = DeltaPostForm(instance=self.post)
+        self.assertEqual(len(form.formsets["tags"].forms), 5)
+
+    def test_only_posted_rows_are_loaded_and_saved(self):
+        data = self.get_data(
+            existing_rows=[
+                (self.tags[1].pk, "changed", 1, False),
+                (self.tags[3].pk, "tag3", 3, True),
+            ],
+            new_rows=[("new", 5)],
+        )
+        form = DeltaPostForm(data, instance=self.post)
+        formset = form.formsets["tags"]
+        self.assertEqual(
+            [tag.pk for tag in formset.get_queryset()],
+            [self.tags[1].pk, self.tags[3].pk],
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+
+        self.assertEqual(
+            [(tag.name, tag.position) for tag in self.post.tags.order_by("position")],
+            [("tag0", 0), ("changed", 1), ("tag2", 2), ("tag4", 4), ("new", 5)],
+        )
+
+    def test_rows_of_other_parents_are_rejected(self):
+        data = self.get_data(
+            existing_rows=[(self.other_tag.pk, "stolen", 7, False)]
+        )
+        form = DeltaPostForm(data, instance=self.post)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(
+            form.formsets["tags"].non_form_errors(),
+            ["Some of the submitted objects do not exist anymore."],
+        )
+        self.assertEqual(Tag.objects.get(pk=self.other_tag.pk).name, "other")
+
+    def test_deleted_objects_are_rejected(self):
+        data = self.get_data(existing_rows=[(self.tags[0].pk, "tag0", 0, False)])
+        self.tags[0].delete()
+        form = DeltaPostForm(data, instance=self.post)
+        self.assertFalse(form.is_valid())
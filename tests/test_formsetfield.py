@@ -1,9 +1,16 @@
+from django import forms
 from django.forms.models import modelformset_factory
 from django.template import Context, Template
 from django.test import TestCase
-from django_superform import SuperModelForm, ModelFormSetField, InlineFormSetField
+from django_superform import (
+    ForeignKeyFormField,
+    InlineFormSetField,
+    ModelFormSetField,
+    SuperForm,
+    SuperModelForm,
+)
 
-from .models import Post, Image
+from .models import Image, Post, Series
 
 
 ImageFormSet = modelformset_factory(Image, fields=["name"])
@@ -41,3 +48,396 @@ class TestFormSetField(TestCase):
         c = Context({"form": form})
         assert 'value="image1"' in t.render(c)
         assert 'value="image2"' in t.render(c)
+
+
+class TestInlineFormSetFieldClassCache(TestCase):
+    def setUp(self):
+        InlineFormSetField.formset_class_cache.clear()
+
+    def test_formset_class_is_reused(self):
+        post = Post.objects.create()
+        first = PostForm(instance=post).formsets["images_inlineformset"]
+        second = PostForm(instance=post).formsets["images_inlineformset"]
+        assert type(first) is type(second)
+
+        stats = InlineFormSetField.formset_class_cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["size"] == 1
+
+    def test_equal_factory_kwargs_share_class(self):
+        field1 = InlineFormSetField(Post, Image, fields=["name"], extra=2)
+        field2 = InlineFormSetField(Post, Image, fields=["name"], extra=2)
+        field3 = InlineFormSetField(Post, Image, fields=["name"], extra=3)
+        form = PostForm()
+        class1 = field1.get_formset_class(form, "images")
+        assert field2.get_formset_class(form, "images") is class1
+        assert field3.get_formset_class(form, "images") is not class1
+
+    def test_cache_opt_out(self):
+        field = InlineFormSetField(
+            Post, Image, fields=["name"], cache_formset_class=False
+        )
+        form = PostForm()
+        class1 = field.get_formset_class(form, "images")
+        class2 = field.get_formset_class(form, "images")
+        assert class1 is not class2
+        assert InlineFormSetField.formset_class_cache.stats()["size"] == 1
+
+    def test_cache_is_bounded(self):
+        cache = InlineFormSetField.formset_class_cache
+        maxsize = cache.maxsize
+        cache.maxsize = 2
+        try:
+            form = PostForm()
+            for extra in range(4):
+                field = InlineFormSetField(Post, Image, fields=["name"], extra=extra)
+                field.get_formset_class(form, "images")
+            assert len(cache) == 2
+        finally:
+            cache.maxsize = maxsize
+
+
+class BulkPostForm(SuperModelForm):
+    class Meta:
+        model = Post
+        fields = ["title"]
+
+    images = InlineFormSetField(
+        Post, Image, fields=["name", "position"], extra=2, bulk_save=True
+    )
+
+
+class TestBulkSave(TestCase):
+    def get_data(self, post, images):
+        data = {
+            "title": "Post",
+            "formset-images-INITIAL_FORMS": len(images),
+            "formset-images-TOTAL_FORMS": len(images) + 2,
+        }
+        for i, image in enumerate(images):
+            data["formset-images-%d-id" % i] = image.pk
+            data["formset-images-%d-post" % i] = post.pk
+            data["formset-images-%d-name" % i] = image.name
+            data["formset-images-%d-position" % i] = image.position
+        return data
+
+    def test_bulk_save(self):
+        post = Post.objects.create(title="Post")
+        images = [
+            post.images.create(name="keep", position=0),
+            post.images.create(name="change", position=1),
+            post.images.create(name="delete", position=2),
+        ]
+        data = self.get_data(post, images)
+        data["formset-images-1-name"] = "changed"
+        data["formset-images-2-DELETE"] = "on"
+        data["formset-images-3-name"] = "new1"
+        data["formset-images-3-position"] = 3
+        data["formset-images-4-name"] = "new2"
+        data["formset-images-4-position"] = 4
+
+        form = BulkPostForm(data, instance=post)
+        self.assertTrue(form.is_valid(), form.errors)
+        # One UPDATE for the post, one DELETE, one UPDATE and one INSERT for
+        # the images.
+        with self.assertNumQueries(4):
+            form.save()
+
+        formset = form.formsets["images"]
+        self.assertEqual(formset.changed_objects, [(images[1], ["name"])])
+        self.assertEqual(formset.deleted_objects, [images[2]])
+        self.assertEqual(len(formset.new_objects), 2)
+        self.assertEqual(
+            list(post.images.values_list("name", "position")),
+            [("keep", 0), ("changed", 1), ("new1", 3), ("new2", 4)],
+        )
+
+    def test_bulk_save_sets_parent_of_new_post(self):
+        data = {
+            "title": "New post",
+            "formset-images-INITIAL_FORMS": 0,
+            "formset-images-TOTAL_FORMS": 1,
+            "formset-images-0-name": "image",
+            "formset-images-0-position": 1,
+        }
+        form = BulkPostForm(data)
+        self.assertTrue(form.is_valid(), form.errors)
+        post = form.save()
+        self.assertEqual(list(post.images.values_list("name", flat=True)), ["image"])
+
+
+class BrokenInlineFormSetField(InlineFormSetField):
+    def save(self, form, name, formset, commit):
+        super(BrokenInlineFormSetField, self).save(form, name, formset, commit)
+        raise RuntimeError("Saving failed")
+
+
+class AtomicPostForm(SuperModelForm):
+    atomic_save = True
+
+    class Meta:
+        model = Post
+        fields = ["title"]
+
+    images = BrokenInlineFormSetField(Post, Image, fields=["name"], extra=1)
+
+
+class TestAtomicSave(TestCase):
+    data = {
+        "title": "Post",
+        "formset-images-INITIAL_FORMS": 0,
+        "formset-images-TOTAL_FORMS": 1,
+        "formset-images-0-name": "image",
+    }
+
+    def test_failing_composite_rolls_back_everything(self):
+        form = AtomicPostForm(self.data)
+        self.assertTrue(form.is_valid(), form.errors)
+        with self.assertRaises(RuntimeError):
+            form.save()
+        self.assertEqual(Post.objects.count(), 0)
+        self.assertEqual(Image.objects.count(), 0)
+
+    def test_without_atomic_save(self):
+        class NonAtomicPostForm(AtomicPostForm):
+            atomic_save = False
+
+        form = NonAtomicPostForm(self.data)
+        self.assertTrue(form.is_valid(), form.errors)
+        with self.assertRaises(RuntimeError):
+            form.save()
+        self.assertEqual(Post.objects.count(), 1)
+
+    def test_savepoints(self):
+        class SavepointPostForm(AtomicPostForm):
+            atomic_savepoints = True
+
+            images = InlineFormSetField(Post, Image, fields=["name"], extra=1)
+
+        form = SavepointPostForm(self.data)
+        self.assertTrue(form.is_valid(), form.errors)
+        post = form.save()
+        self.assertEqual(list(post.images.values_list("name", flat=True)), ["image"])
+
+
+class SkipUnchangedPostForm(BulkPostForm):
+    skip_unchanged = True
+
+
+class TestSkipUnchanged(TestCase):
+    def get_data(self, post, image):
+        return {
+            "title": "Post",
+            "formset-images-INITIAL_FORMS": 1,
+            "formset-images-TOTAL_FORMS": 1,
+            "formset-images-0-id": image.pk,
+            "formset-images-0-post": post.pk,
+            "formset-images-0-name": image.name,
+            "formset-images-0-position": image.position,
+        }
+
+    def test_unchanged_formset_is_not_saved(self):
+        post = Post.objects.create(title="Post")
+        image = post.images.create(name="image", position=0)
+        form = SkipUnchangedPostForm(self.get_data(post, image), instance=post)
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertFalse(form.has_changed())
+        with self.assertNumQueries(0):
+            form.save()
+
+    def test_changed_formset_is_saved(self):
+        post = Post.objects.create(title="Post")
+        image = post.images.create(name="image", position=0)
+        data = self.get_data(post, image)
+        data["formset-images-0-name"] = "changed"
+        form = SkipUnchangedPostForm(data, instance=post)
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.changed_data, ["images.0.name"])
+        # Only the UPDATE of the image.
+        with self.assertNumQueries(1):
+            form.save()
+        self.assertEqual(post.images.get().name, "changed")
+
+
+PostFormSet = modelformset_factory(Post, fields=["title"], extra=0)
+
+
+class SeriesPostsForm(SuperModelForm):
+    class Meta:
+        model = Series
+        fields = ["title"]
+
+    posts = ModelFormSetField(PostFormSet, select_related=["series"])
+    inline_posts = InlineFormSetField(
+        Series,
+        Post,
+        fields=["title"],
+        extra=0,
+        prefetch_related=["images"],
+        only=["id", "title", "series"],
+    )
+    first_post = ModelFormSetField(
+        PostFormSet,
+        kwargs={"queryset": Post.objects.filter(title="Post 0")},
+        select_related=["series"],
+    )
+
+
+class TestQuerysetOptions(TestCase):
+    def setUp(self):
+        self.series = Series.objects.create(title="Series")
+        for i in range(3):
+            post = Post.objects.create(title="Post %d" % i, series=self.series)
+            post.images.create(name="Image", image_url="http://example.com/")
+
+    def test_select_related(self):
+        form = SeriesPostsForm(instance=self.series)
+        # One query for the posts with their series.
+        with self.assertNumQueries(1):
+            titles = [
+                f.instance.series.title for f in form.formsets["posts"].forms
+            ]
+        self.assertEqual(titles, ["Series"] * 3)
+
+    def test_select_related_for_bound_formset(self):
+        data = {
+            "title": "Series",
+            "formset-posts-TOTAL_FORMS": "3",
+            "formset-posts-INITIAL_FORMS": "3",
+        }
+        for i, post in enumerate(Post.objects.order_by("pk")):
+            data["formset-posts-%d-id" % i] = post.pk
+            data["formset-posts-%d-title" % i] = "Changed %d" % i
+        form = SeriesPostsForm(data, instance=self.series)
+        formset = form.formsets["posts"]
+        # One query for the posts with their series and one per form for the
+        # validation of the primary key. The series are not queried again.
+        with self.assertNumQueries(4):
+            self.assertTrue(formset.is_valid(), formset.errors)
+            titles = [f.instance.series.title for f in formset.forms]
+        self.assertEqual(titles, ["Series"] * 3)
+
+    def test_prefetch_related_and_only(self):
+        form = SeriesPostsForm(instance=self.series)
+        formset = form.formsets["inline_posts"]
+        queryset = formset.get_queryset()
+        self.assertEqual(tuple(queryset._prefetch_related_lookups), ("images",))
+        self.assertEqual(
+            set(queryset.query.deferred_loading[0]), set(["id", "title", "series"])
+        )
+        # One query for the posts and one for all their images.
+        with self.assertNumQueries(2):
+            counts = [len(f.instance.images.all()) for f in formset.forms]
+        self.assertEqual(counts, [1, 1, 1])
+
+    def test_given_queryset_is_used(self):
+        form = SeriesPostsForm(instance=self.series)
+        formset = form.formsets["first_post"]
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                [f.instance.series.title for f in formset.forms], ["Series"]
+            )
+
+
+class SeriesTitleForm(forms.ModelForm):
+    class Meta:
+        model = Series
+        fields = ["title"]
+
+
+class PostRowForm(SuperModelForm):
+    series = ForeignKeyFormField(SeriesTitleForm)
+
+    class Meta:
+        model = Post
+        fields = ["title"]
+
+
+PostRowFormSet = modelformset_factory(Post, form=PostRowForm, extra=0)
+
+
+class PostRowsForm(SuperForm):
+    posts = ModelFormSetField(PostRowFormSet)
+
+
+class TestPreloadRelated(TestCase):
+    def setUp(self):
+        for i in range(3):
+            series = Series.objects.create(title="Series %d" % i)
+            Post.objects.create(title="Post %d" % i, series=series)
+        Post.objects.create(title="Post without series")
+
+    def test_related_objects_are_loaded_once(self):
+        # The series are loaded together with the posts.
+        with self.assertNumQueries(1):
+            form = PostRowsForm()
+            titles = [
+                f.forms["series"].instance.title
+                for f in form.formsets["posts"].forms
+            ]
+        self.assertEqual(
+            sorted(titles), ["", "Series 0", "Series 1", "Series 2"]
+        )
+
+
+class WindowedPostsForm(SuperModelForm):
+    class Meta:
+        model = Series
+        fields = ["title"]
+
+    posts = InlineFormSetField(
+        Series, Post, fields=["title"], extra=0, window_size=2
+    )
+
+
+class TestWindow(TestCase):
+    def setUp(self):
+        self.series = Series.objects.create(title="Series")
+        self.posts = [
+            Post.objects.create(title="Post %d" % i, series=self.series)
+            for i in range(5)
+        ]
+
+    def test_unbound_formset_contains_window(self):
+        form = WindowedPostsForm(
+            instance=self.series, initial={"posts_offset": 2}
+        )
+        formset = form.formsets["posts"]
+        # A single query for the posts of the window.
+        with self.assertNumQueries(1):
+            titles = [f.instance.title for f in formset.forms]
+        self.assertEqual(titles, ["Post 2", "Post 3"])
+        self.assertEqual(formset.management_form.initial["TOTAL_FORMS"], 2)
+        self.assertEqual(formset.management_form.initial["INITIAL_FORMS"], 2)
+        self.assertEqual(
+            [f.prefix for f in formset.forms],
+            ["formset-posts-0", "formset-posts-1"],
+        )
+
+    def test_first_window_by_default(self):
+        form = WindowedPostsForm(instance=self.series)
+        self.assertEqual(
+            [f.instance.title for f in form.formsets["posts"].forms],
+            ["Post 0", "Post 1"],
+        )
+
+    def test_bound_window_saves_posted_rows(self):
+        data = {
+            "title": "Series",
+            "formset-posts-TOTAL_FORMS": "2",
+            "formset-posts-INITIAL_FORMS": "2",
+            "formset-posts-0-id": self.posts[2].pk,
+            "formset-posts-0-series": self.series.pk,
+            "formset-posts-0-title": "Changed 2",
+            "formset-posts-1-id": self.posts[3].pk,
+            "formset-posts-1-series": self.series.pk,
+            "formset-posts-1-title": "Post 3",
+        }
+        form = WindowedPostsForm(data, instance=self.series)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertEqual(
+            list(self.series.post_set.order_by("pk").values_list("title", flat=True)),
+            ["Post 0", "Post 1", "Changed 2", "Post 3", "Post 4"],
+        )
@@ -0,0 +1,135 @@
+import logging
+
+from django import forms
+from django.forms.formsets import formset_factory
+from django.template import Context, Template
+from django.test import TestCase
+from django_superform import FormField, FormSetField, SuperForm
+from django_superform.instrumentation import (
+    LoggingCollector,
+    MemoryCollector,
+    NullCollector,
+    get_collector,
+    set_collector,
+    use_collector,
+)
+
+
+class AddressForm(forms.Form):
+    street = forms.CharField()
+
+
+class TagForm(forms.Form):
+    tag = forms.CharField()
+
+
+class CommentForm(SuperForm):
+    text = forms.CharField()
+    tags = FormField(TagForm)
+
+
+CommentFormSet = formset_factory(CommentForm, extra=0)
+
+
+class PostForm(SuperForm):
+    title = forms.CharField()
+    address = FormField(AddressForm)
+    comments = FormSetField(CommentFormSet)
+
+
+DATA = {
+    "title": "Title",
+    "form-address-street": "Street",
+    "formset-comments-TOTAL_FORMS": 2,
+    "formset-comments-INITIAL_FORMS": 0,
+    "formset-comments-0-text": "First",
+    "formset-comments-0-form-tags-tag": "a",
+    "formset-comments-1-text": "Second",
+    "formset-comments-1-form-tags-tag": "b",
+}
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super(RecordingHandler, self).__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class InstrumentationTests(TestCase):
+    def test_null_collector_is_default(self):
+        self.assertIsInstance(get_collector(), NullCollector)
+        form = PostForm(DATA)
+        self.assertIsNone(form._instrumentation)
+        self.assertTrue(form.is_valid())
+
+    def test_memory_collector(self):
+        collector = MemoryCollector()
+        with use_collector(collector):
+            form = PostForm(DATA)
+            self.assertTrue(form.is_valid())
+            Template("{{ form.address }}").render(Context({"form": form}))
+
+        stats = collector.stats()
+        self.assertEqual(
+            sorted(stats.keys()),
+            [
+                ("address", "clean"),
+                ("address", "init"),
+                ("address", "render"),
+                ("comments", "clean"),
+                ("comments", "init"),
+                ("comments.0.tags", "clean"),
+                ("comments.0.tags", "init"),
+                ("comments.1.tags", "clean"),
+                ("comments.1.tags", "init"),
+            ],
+        )
+        self.assertEqual(stats[("address", "init")]["calls"], 1)
+        self.assertEqual(stats[("address", "init")]["queries"], 0)
+        self.assertTrue(stats[("comments", "clean")]["time"] > 0)
+
+    def test_lazily_built_formset_forms_get_formset_path(self):
+        collector = MemoryCollector()
+        initial = {"comments": [{"text": "First"}, {"text": "Second"}]}
+        with use_collector(collector):
+            form = PostForm(initial=initial)
+            # The forms are built outside of the measured init of the
+            # formset, like when the formset is iterated in a template.
+            forms = list(form.formsets["comments"])
+        self.assertEqual(len(forms), 2)
+        stats = collector.stats()
+        self.assertIn(("comments.0.tags", "init"), stats)
+        self.assertIn(("comments.1.tags", "init"), stats)
+        self.assertNotIn(("tags", "init"), stats)
+
+    def test_set_collector(self):
+        collector = MemoryCollector()
+        set_collector(collector)
+        try:
+            PostForm()
+        finally:
+            set_collector(None)
+        self.assertIn(("address", "init"), collector.stats())
+        self.assertIsInstance(get_collector(), NullCollector)
+
+    def test_logging_collector_sampling(self):
+        handler = RecordingHandler()
+        logger = logging.getLogger("tests.instrumentation")
+        logger.setLevel(logging.INFO)
+        logger.addHandler(handler)
+        try:
+            with use_collector(LoggingCollector(logger=logger, sample_rate=0)):
+                PostForm(DATA).is_valid()
+            self.assertEqual(handler.records, [])
+
+            with use_collector(LoggingCollector(logger=logger)):
+                PostForm(DATA).is_valid()
+        finally:
+            logger.removeHandler(handler)
+        messages = [record.getMessage() for record in handler.records]
+        self.assertTrue(
+            any(m.startswith("superform clean comments.1.tags:") for m in messages)
+        )
@@ -1,7 +1,7 @@
 from django import forms
 from django.forms.formsets import formset_factory
 from django.test import TestCase
-from django_superform import SuperForm, FormSetField
+from django_superform import SuperForm, FormField, FormSetField
 
 
 class InputWithCSS(forms.TextInput):
@@ -58,3 +58,81 @@ class FormMediaTests(TestCase):
 
         self.assertEqual(form.media._css, expected_css)
         self.assertEqual(form.media._js, expected_js)
+
+    def test_media_does_not_build_nested_forms(self):
+        class LazyFormWithNestedMedia(FormWithNestedMedia):
+            lazy_composite_fields = True
+
+        form = LazyFormWithNestedMedia()
+        self.assertIn("http://example.com/email_widget_style.css", form.media._css["all"])
+        self.assertFalse(form.formsets.is_built("emails"))
+
+    def test_media_is_cached_per_class(self):
+        form = FormWithNestedMedia()
+        form.media
+        plan_media = FormWithNestedMedia.composite_plan.media
+        self.assertIsNotNone(plan_media)
+        FormWithNestedMedia().media
+        self.assertIs(FormWithNestedMedia.composite_plan.media, plan_media)
+
+    def test_nested_superform_media(self):
+        class OuterForm(SuperForm):
+            nested = FormField(FormWithNestedMedia)
+
+        form = OuterForm()
+        self.assertIn("/static/print.css", form.media._css["print"])
+        self.assertIn("http://example.com/email_widget_style.css", form.media._css["all"])
+        self.assertIn("/static/1.js", form.media._js)
+
+    def test_add_composite_field_updates_media(self):
+        class PhoneForm(forms.Form):
+            phone = forms.CharField(widget=InputWithJS)
+
+        class PlainForm(SuperForm):
+            pass
+
+        form = PlainForm()
+        self.assertEqual(form.media._js, [])
+        form.add_composite_field("phone", FormField(PhoneForm))
+        self.assertEqual(
+            form.media._js, ["http://example.com/check_username_available.js"]
+        )
+        self.assertEqual(PlainForm().media._js, [])
+
+    def test_widgets_set_in_init_are_included(self):
+        class DynamicEmailForm(forms.Form):
+            email = forms.EmailField()
+
+            def __init__(self, *args, **kwargs):
+                super(DynamicEmailForm, self).__init__(*args, **kwargs)
+                self.fields["email"].widget = InputWithJS()
+
+        class DynamicForm(SuperForm):
+            nested = FormField(DynamicEmailForm)
+            emails = FormSetField(formset_factory(DynamicEmailForm))
+
+        form = DynamicForm()
+        self.assertEqual(
+            form.media._js, ["http://example.com/check_username_available.js"]
+        )
+        self.assertIsNone(DynamicForm.composite_plan.media)
+
+    def test_widgets_set_in_init_of_deeply_nested_forms_are_included(self):
+        class DynamicEmailForm(forms.Form):
+            email = forms.EmailField()
+
+            def __init__(self, *args, **kwargs):
+                super(DynamicEmailForm, self).__init__(*args, **kwargs)
+                self.fields["email"].widget = InputWithJS()
+
+        class NestedForm(SuperForm):
+            nested = FormField(DynamicEmailForm)
+
+        class OuterForm(SuperForm):
+            outer = FormField(NestedForm)
+
+        form = OuterForm()
+        self.assertEqual(
+            form.media._js, ["http://example.com/check_username_available.js"]
+        )
+        self.assertIsNone(OuterForm.composite_plan.media)
@@ -1,9 +1,11 @@
 from django import forms
+from django.db import connection
 from django.template import Context, Template
 from django.test import TestCase
-from django_superform import SuperModelForm, ModelFormField
+from django.test.utils import CaptureQueriesContext
+from django_superform import SuperModelForm, ModelFormField, ForeignKeyFormField
 
-from .models import Series, Post
+from .models import Post, Review, Series
 
 
 class UseFirstModelFormField(ModelFormField):
@@ -154,3 +156,252 @@ class FormFieldTests(TestCase):
         )
         rendered = Template("{{ form.series }}").render(Context({"form": form}))
         assert 'value="my title"' in rendered
+
+
+class SeriesPostForm(SuperModelForm):
+    series = ForeignKeyFormField(SeriesForm)
+
+    class Meta:
+        model = Post
+        fields = ("title",)
+
+
+class PostTitleForm(forms.ModelForm):
+    class Meta:
+        model = Post
+        fields = ("title",)
+
+
+class ReviewForm(SuperModelForm):
+    post = ForeignKeyFormField(PostTitleForm)
+    series = ForeignKeyFormField(SeriesForm)
+
+    class Meta:
+        model = Review
+        fields = ("text",)
+
+
+class ForeignKeyFormFieldTests(TestCase):
+    def test_allow_blank_is_compiled(self):
+        entry = SeriesPostForm.composite_plan.entries["series"]
+        self.assertEqual(entry.data["model_blank"], (Post, "series", True))
+
+        form = SeriesPostForm()
+        field = form.composite_fields.lookup("series")
+        self.assertTrue(field.allow_blank(form, "series"))
+
+    def test_allow_blank_for_copied_field(self):
+        form = SeriesPostForm()
+        field = form.composite_fields["series"]
+        self.assertTrue(field.allow_blank(form, "series"))
+        field.blank = False
+        self.assertFalse(field.allow_blank(form, "series"))
+
+    def test_parent_is_written_once(self):
+        form = SeriesPostForm({"title": "Post", "form-series-title": "Series"})
+        self.assertTrue(form.is_valid(), form.errors)
+        # One INSERT for the series and one for the post.
+        with self.assertNumQueries(2):
+            post = form.save()
+        post = Post.objects.get(pk=post.pk)
+        self.assertEqual(post.series.title, "Series")
+
+    def test_existing_parent_is_written_once(self):
+        series = Series.objects.create(title="Old series")
+        post = Post.objects.create(title="Post", series=series)
+        form = SeriesPostForm(
+            {"title": "Changed", "form-series-title": "New series"}, instance=post
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        with self.assertNumQueries(2):
+            form.save()
+        post = Post.objects.get(pk=post.pk)
+        self.assertEqual(post.title, "Changed")
+        self.assertEqual(post.series.pk, series.pk)
+        self.assertEqual(post.series.title, "New series")
+
+    def test_related_objects_are_preloaded(self):
+        series = Series.objects.create(title="Series")
+        post = Post.objects.create(title="Post", series=series)
+        post = Post.objects.get(pk=post.pk)
+        self.assertEqual(
+            SeriesPostForm.composite_plan.related_fields, ["series"]
+        )
+        with self.assertNumQueries(1):
+            form = SeriesPostForm(instance=post)
+        with self.assertNumQueries(0):
+            self.assertEqual(form.forms["series"].instance, series)
+
+    def test_related_objects_of_different_models_are_loaded_together(self):
+        series = Series.objects.create(title="Series")
+        post = Post.objects.create(title="Post")
+        review = Review.objects.create(text="Review", post=post, series=series)
+        review = Review.objects.get(pk=review.pk)
+        with self.assertNumQueries(1):
+            form = ReviewForm(instance=review)
+        with self.assertNumQueries(0):
+            self.assertEqual(form.forms["post"].instance, post)
+            self.assertEqual(form.forms["series"].instance, series)
+
+    def test_changed_foreign_keys_are_loaded(self):
+        series = Series.objects.create(title="Series")
+        other_series = Series.objects.create(title="Other series")
+        review = Review.objects.create(text="Review", series=series)
+        review = Review.objects.get(pk=review.pk)
+        review.series_id = other_series.pk
+        form = ReviewForm(instance=review)
+        self.assertEqual(form.forms["series"].instance, other_series)
+
+    def test_save_forms_after_save_form(self):
+        form = SeriesPostForm({"title": "Post", "form-series-title": "Series"})
+        self.assertTrue(form.is_valid(), form.errors)
+        post = form.save_form()
+        form.save_forms()
+        post = Post.objects.get(pk=post.pk)
+        self.assertEqual(post.series.title, "Series")
+
+    def test_commit_false(self):
+        form = SeriesPostForm({"title": "Post", "form-series-title": "Series"})
+        self.assertTrue(form.is_valid(), form.errors)
+        post = form.save(commit=False)
+        self.assertIsNone(post.pk)
+        self.assertEqual(Series.objects.count(), 0)
+
+        post.save()
+        form.save_m2m()
+        post = Post.objects.get(pk=post.pk)
+        self.assertEqual(post.series.title, "Series")
+
+
+class SkipUnchangedPostForm(SuperModelForm):
+    skip_unchanged = True
+    series = ForeignKeyFormField(SeriesForm)
+
+    class Meta:
+        model = Post
+        fields = ("title",)
+
+
+class SkipUnchangedTests(TestCase):
+    def setUp(self):
+        self.series = Series.objects.create(title="Series")
+        self.post = Post.objects.create(title="Post", series=self.series)
+
+    def get_form(self, title="Post", series_title="Series"):
+        form = SkipUnchangedPostForm(
+            {"title": title, "form-series-title": series_title},
+            instance=self.post,
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        return form
+
+    def test_unchanged_form_is_not_saved(self):
+        form = self.get_form()
+        self.assertFalse(form.has_changed())
+        self.assertEqual(form.changed_data, [])
+        with self.assertNumQueries(0):
+            self.assertEqual(form.save(), self.post)
+
+    def test_only_changed_nested_form_is_saved(self):
+        form = self.get_form(series_title="Changed")
+        self.assertTrue(form.has_changed())
+        self.assertEqual(form.changed_data, ["series.title"])
+        # Only the UPDATE of the series.
+        with self.assertNumQueries(1):
+            form.save()
+        self.assertEqual(Series.objects.get().title, "Changed")
+
+    def test_only_changed_parent_is_saved(self):
+        form = self.get_form(title="Changed")
+        self.assertEqual(form.changed_data, ["title"])
+        with self.assertNumQueries(1):
+            form.save()
+        post = Post.objects.get()
+        self.assertEqual(post.title, "Changed")
+        self.assertEqual(post.series, self.series)
+
+    def test_parent_is_saved_for_new_nested_object(self):
+        post = Post.objects.create(title="Post")
+        form = SkipUnchangedPostForm(
+            {"title": "Post", "form-series-title": "New"}, instance=post
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        # INSERT of the series and UPDATE of the post's reference.
+        with self.assertNumQueries(2):
+            form.save()
+        self.assertEqual(Post.objects.get(pk=post.pk).series.title, "New")
+
+    def test_unchanged_forms_are_saved_by_default(self):
+        form = SeriesPostForm(
+            {"title": "Post", "form-series-title": "Series"}, instance=self.post
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        with self.assertNumQueries(2):
+            form.save()
+
+
+class PartialUpdatePostForm(SuperModelForm):
+    partial_update = True
+    series = ForeignKeyFormField(SeriesForm)
+
+    class Meta:
+        model = Post
+        fields = ("title",)
+
+
+class PartialUpdateSeriesForm(SuperModelForm):
+    post = UseFirstModelFormField(PostTitleForm, partial_update=True)
+
+    class Meta:
+        model = Series
+        fields = ("title",)
+
+
+class PartialUpdateTests(TestCase):
+    def setUp(self):
+        self.series = Series.objects.create(title="Series")
+        self.post = Post.objects.create(title="Post", series=self.series)
+
+    def save(self, form):
+        self.assertTrue(form.is_valid(), form.errors)
+        with CaptureQueriesContext(connection) as queries:
+            form.save()
+        return [query["sql"] for query in queries]
+
+    def test_parent_writes_changed_fields(self):
+        form = PartialUpdatePostForm(
+            {"title": "Changed", "form-series-title": "Series"}, instance=self.post
+        )
+        sql = self.save(form)
+        self.assertEqual(len(sql), 2)
+        self.assertIn("title", sql[1])
+        self.assertNotIn("series_id", sql[1])
+        self.assertEqual(Post.objects.get().title, "Changed")
+
+    def test_parent_writes_reference_to_new_object(self):
+        post = Post.objects.create(title="Other")
+        form = PartialUpdatePostForm(
+            {"title": "Other", "form-series-title": "New"}, instance=post
+        )
+        self.save(form)
+        self.assertEqual(Post.objects.get(pk=post.pk).series.title, "New")
+
+    def test_nested_form_writes_changed_fields(self):
+        form = PartialUpdateSeriesForm(
+            {"title": "Series", "form-post-title": "Changed"},
+            instance=self.series,
+        )
+        sql = self.save(form)
+        post_updates = [query for query in sql if "tests_post" in query]
+        self.assertEqual(len(post_updates), 1)
+        self.assertNotIn("series_id", post_updates[0])
+        post = Post.objects.get()
+        self.assertEqual(post.title, "Changed")
+        self.assertEqual(post.series, self.series)
+
+    def test_unchanged_nested_form_writes_nothing(self):
+        form = PartialUpdateSeriesForm(
+            {"title": "Series", "form-post-title": "Post"}, instance=self.series
+        )
+        sql = self.save(form)
+        self.assertFalse([query for query in sql if "tests_post" in query])
@@ -1,11 +1,19 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import django
 from django import forms
 from django.forms.forms import ErrorDict, ErrorList
 from django.forms.formsets import formset_factory
+from django.http import StreamingHttpResponse
 from django.test import TestCase
 from django_superform import FormField
 from django_superform import FormSetField
+from django_superform import InlineFormSetField
 from django_superform import SuperForm
+from django_superform import SuperModelForm
+
+from .models import Post, Series
 
 
 class EmailForm(forms.Form):
@@ -131,3 +139,331 @@ class FormSetsInSuperFormsTests(TestCase):
 
         self.assertFalse(form.is_valid())
         self.assertEqual(form.errors["emails"], expected_errors)
+
+
+class ConfiguredForm(SuperModelForm):
+    nested_form = FormField(NameForm, kwargs={"initial": {"name": "default"}})
+    posts = InlineFormSetField(
+        Series,
+        Post,
+        fields=["title"],
+        labels={"title": "Title"},
+        extra=1,
+        select_related=[],
+    )
+
+    class Meta:
+        model = Series
+        fields = ["title"]
+
+
+class CompositeFieldsCopyOnWriteTests(TestCase):
+    def test_fields_are_shared_until_accessed(self):
+        form = AccountForm()
+        base_field = AccountForm.base_composite_fields["nested_form"]
+        self.assertIs(form.composite_fields.lookup("nested_form"), base_field)
+
+        field = form.composite_fields["nested_form"]
+        self.assertIsNot(field, base_field)
+        self.assertIs(form.composite_fields["nested_form"], field)
+        self.assertIs(form.composite_fields.lookup("nested_form"), field)
+
+    def test_changes_do_not_leak_into_other_instances(self):
+        form = AccountForm()
+        field = form.composite_fields["nested_form"]
+        field.required = False
+        field.widget.attrs["class"] = "changed"
+        field.default_kwargs["initial"] = {"name": "changed"}
+
+        base_field = AccountForm.base_composite_fields["nested_form"]
+        self.assertTrue(base_field.required)
+        self.assertNotIn("class", base_field.widget.attrs)
+        self.assertEqual(base_field.default_kwargs, {})
+        self.assertIs(field.widget.field, field)
+        self.assertIs(base_field.widget.field, base_field)
+
+        other_form = AccountForm()
+        self.assertTrue(other_form.composite_fields["nested_form"].required)
+
+    def test_nested_config_does_not_leak_into_other_instances(self):
+        form = ConfiguredForm()
+        field = form.composite_fields["nested_form"]
+        field.default_kwargs["initial"]["name"] = "changed"
+        inline = form.composite_fields["posts"]
+        inline.formset_factory_kwargs["extra"] = 5
+        inline.formset_factory_kwargs["labels"]["title"] = "Changed"
+        inline.select_related.append("series")
+
+        other_form = ConfiguredForm()
+        self.assertEqual(
+            other_form.composite_fields["nested_form"].default_kwargs,
+            {"initial": {"name": "default"}},
+        )
+        other_inline = other_form.composite_fields["posts"]
+        self.assertEqual(other_inline.formset_factory_kwargs["extra"], 1)
+        self.assertEqual(
+            other_inline.formset_factory_kwargs["labels"], {"title": "Title"}
+        )
+        self.assertEqual(other_inline.select_related, [])
+
+    def test_add_composite_field_is_per_instance(self):
+        form = AccountForm()
+        field = FormField(NameForm)
+        form.add_composite_field("extra_form", field)
+        self.assertIs(form.composite_fields["extra_form"], field)
+        self.assertIn("extra_form", form.forms)
+        self.assertNotIn("extra_form", AccountForm.base_composite_fields)
+        self.assertNotIn("extra_form", AccountForm().composite_fields)
+
+
+class CountingFormField(FormField):
+    def __init__(self, *args, **kwargs):
+        super(CountingFormField, self).__init__(*args, **kwargs)
+        self.built = []
+
+    def get_form(self, form, name):
+        self.built.append(name)
+        return super(CountingFormField, self).get_form(form, name)
+
+
+class LazyAccountForm(AccountForm):
+    lazy_composite_fields = True
+
+    counted_form = CountingFormField(NameForm)
+
+
+class LazyCompositeFieldsTests(TestCase):
+    def setUp(self):
+        self.field = LazyAccountForm.base_composite_fields["counted_form"]
+        self.field.built = []
+
+    def test_nothing_is_built_in_init(self):
+        form = LazyAccountForm()
+        self.assertEqual(self.field.built, [])
+        self.assertEqual(
+            list(form.forms.keys()), ["nested_form", "counted_form"]
+        )
+        self.assertFalse(form.forms.is_built("counted_form"))
+        self.assertFalse(form.formsets.is_built("emails"))
+
+    def test_built_on_first_access(self):
+        form = LazyAccountForm()
+        nested = form["counted_form"]["name"]
+        self.assertEqual(nested.name, "name")
+        self.assertEqual(self.field.built, ["counted_form"])
+        self.assertIs(
+            form.get_composite_field_value("counted_form"),
+            form.forms["counted_form"],
+        )
+        self.assertEqual(self.field.built, ["counted_form"])
+        self.assertFalse(form.formsets.is_built("emails"))
+        self.assertIsInstance(form.formsets["emails"], EmailFormSet)
+
+    def test_validation_builds_everything(self):
+        form = LazyAccountForm(
+            {
+                "formset-emails-INITIAL_FORMS": 0,
+                "formset-emails-TOTAL_FORMS": 1,
+                "formset-emails-0-email": "foobar",
+                "username": "TestUser",
+                "form-nested_form-name": "Some Name",
+            }
+        )
+        self.assertFalse(form.is_valid())
+        self.assertEqual(self.field.built, ["counted_form"])
+        self.assertTrue(form.errors["counted_form"]["name"])
+        self.assertTrue(form.errors["emails"])
+        self.assertNotIn("nested_form", form.errors)
+
+
+class CompositeFieldPlanTests(TestCase):
+    def test_plan_is_compiled_per_class(self):
+        plan = AccountForm.composite_plan
+        self.assertEqual(list(plan.entries.keys()), ["emails", "nested_form"])
+        self.assertEqual(plan.form_names, ["nested_form"])
+        self.assertEqual(plan.formset_names, ["emails"])
+        self.assertEqual(plan.entries["nested_form"].data["prefix"], "form-nested_form")
+        self.assertFalse(plan.entries["emails"].savable)
+
+        subclass_plan = SubclassedAccountForm.composite_plan
+        self.assertEqual(subclass_plan.form_names, ["nested_form", "nested_form_2"])
+
+    def test_copied_fields_are_not_in_plan(self):
+        form = AccountForm(prefix="account")
+        field = form.composite_fields["nested_form"]
+        self.assertIsNone(AccountForm.composite_plan.get("nested_form", field))
+        self.assertIsNone(field.get_compiled(form, "nested_form"))
+        field.prefix_name = "other"
+        self.assertEqual(field.get_prefix(form, "nested_form"), "account-other-nested_form")
+
+    def test_entries_of_copied_fields_are_compiled_once(self):
+        form = AccountForm()
+        field = form.composite_fields["nested_form"]
+        entry = form._get_plan_entry("nested_form")
+        self.assertIs(entry.field, field)
+        self.assertIs(form._get_plan_entry("nested_form"), entry)
+
+        replacement = FormField(NameForm)
+        form.composite_fields["nested_form"] = replacement
+        self.assertIs(form._get_plan_entry("nested_form").field, replacement)
+
+    def test_prefix_uses_form_prefix(self):
+        form = AccountForm(prefix="account")
+        self.assertEqual(form.forms["nested_form"].prefix, "account-form-nested_form")
+        self.assertEqual(form.formsets["emails"].prefix, "account-formset-emails")
+
+
+class ThreadRecordingForm(forms.Form):
+    name = forms.CharField()
+
+    def clean(self):
+        self.clean_thread = threading.current_thread()
+        return super(ThreadRecordingForm, self).clean()
+
+
+class ParallelAccountForm(SuperForm):
+    parallel_clean = True
+    parallel_clean_workers = 2
+
+    username = forms.CharField()
+    emails = FormSetField(EmailFormSet)
+    first = FormField(ThreadRecordingForm)
+    second = FormField(ThreadRecordingForm)
+
+
+class ParallelCleanTests(TestCase):
+    data = {
+        "formset-emails-INITIAL_FORMS": 0,
+        "formset-emails-TOTAL_FORMS": 1,
+        "formset-emails-0-email": "foobar",
+        "username": "TestUser",
+        "form-first-name": "First",
+    }
+
+    def test_errors_match_sequential_clean(self):
+        form = ParallelAccountForm(self.data)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(list(form.errors.keys()), ["second", "emails"])
+        self.assertTrue(form.errors["second"]["name"])
+        self.assertIsInstance(form.errors["second"], ErrorDict)
+        self.assertIsInstance(form.errors["emails"], ErrorList)
+        self.assertIsNot(
+            form.forms["first"].clean_thread, threading.current_thread()
+        )
+
+        class SequentialAccountForm(ParallelAccountForm):
+            parallel_clean = False
+
+        sequential = SequentialAccountForm(self.data)
+        self.assertFalse(sequential.is_valid())
+        self.assertEqual(form.errors, sequential.errors)
+        self.assertIs(
+            sequential.forms["first"].clean_thread, threading.current_thread()
+        )
+
+    def test_shared_executor_is_not_shut_down(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+
+        class SharedExecutorForm(ParallelAccountForm):
+            clean_executor = executor
+
+        form = SharedExecutorForm(self.data)
+        self.assertFalse(form.is_valid())
+        self.assertIsNot(
+            form.forms["first"].clean_thread, threading.current_thread()
+        )
+        self.assertEqual(executor.submit(len, "abc").result(), 3)
+
+    def test_worker_exceptions_are_raised(self):
+        class BrokenForm(forms.Form):
+            def clean(self):
+                raise RuntimeError("broken")
+
+        form = ParallelAccountForm(self.data)
+        form.add_composite_field("broken", FormField(BrokenForm))
+        with self.assertRaises(RuntimeError):
+            form.full_clean()
+
+
+class StreamingTests(TestCase):
+    def get_data(self):
+        return {
+            "username": "john",
+            "formset-emails-INITIAL_FORMS": "0",
+            "formset-emails-TOTAL_FORMS": "2",
+            "formset-emails-0-email": "john@example.com",
+            "formset-emails-1-email": "jd@example.com",
+            "form-nested_form-name": "John Doe",
+        }
+
+    def test_stream_yields_form_by_form(self):
+        form = AccountForm(self.get_data())
+        chunks = list(form.stream())
+        # The form's own fields, management form, two emails, the end of the
+        # formset and the nested form.
+        self.assertEqual(len(chunks), 6)
+        self.assertIn('name="username"', chunks[0])
+        self.assertIn("formset-emails-TOTAL_FORMS", chunks[1])
+        self.assertIn("john@example.com", chunks[2])
+        self.assertIn("jd@example.com", chunks[3])
+        self.assertIn('name="form-nested_form-name"', chunks[5])
+
+    def test_streamed_formset_matches_rendered_formset(self):
+        form = AccountForm(self.get_data())
+        bound_field = form["emails"]
+        widget = bound_field.field.widget
+        formset = form.formsets["emails"]
+        self.assertEqual(
+            "".join(bound_field.stream()), widget.render("emails", formset)
+        )
+
+    def test_stream_can_be_used_in_streaming_response(self):
+        form = AccountForm(self.get_data())
+        response = StreamingHttpResponse(form.stream())
+        content = b"".join(response.streaming_content).decode("utf-8")
+        self.assertIn("jd@example.com", content)
+        self.assertIn("John Doe", content)
+
+
+class ChangeDetectionTests(TestCase):
+    initial = {
+        "username": "john",
+        "emails": [{"email": "john@example.com"}],
+        "nested_form": {"name": "John"},
+    }
+
+    def get_data(self, **changes):
+        data = {
+            "username": "john",
+            "formset-emails-INITIAL_FORMS": "1",
+            "formset-emails-TOTAL_FORMS": "1",
+            "formset-emails-0-email": "john@example.com",
+            "form-nested_form-name": "John",
+        }
+        data.update(changes)
+        return data
+
+    def test_unchanged(self):
+        form = AccountForm(self.get_data(), initial=self.initial)
+        self.assertFalse(form.has_changed())
+        self.assertEqual(form.changed_data, [])
+
+    def test_nested_changes(self):
+        data = self.get_data(**{
+            "username": "jane",
+            "formset-emails-0-email": "jane@example.com",
+            "form-nested_form-name": "Jane",
+        })
+        form = AccountForm(data, initial=self.initial)
+        self.assertTrue(form.has_changed())
+        self.assertEqual(
+            form.changed_data,
+            ["username", "emails.0.email", "nested_form.name"],
+        )
+
+    def test_only_nested_change(self):
+        data = self.get_data(**{"form-nested_form-name": "Jane"})
+        form = AccountForm(data, initial=self.initial)
+        self.assertTrue(form.has_changed())
+        self.assertEqual(form.changed_data, ["nested_form.name"])
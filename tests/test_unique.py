@@ -0,0 +1,99 @@
+from django.test import TestCase
+from django_superform import InlineFormSetField, SuperModelForm
+from django_superform.unique import BatchUniqueValidation
+
+from .models import Post, Tag
+
+
+class BatchUniquePostForm(SuperModelForm):
+    tags = InlineFormSetField(
+        Post, Tag, fields=["name", "position"], extra=0, batch_unique=True
+    )
+
+    class Meta:
+        model = Post
+        fields = ["title"]
+
+
+class PostForm(SuperModelForm):
+    tags = InlineFormSetField(Post, Tag, fields=["name", "position"], extra=0)
+
+    class Meta:
+        model = Post
+        fields = ["title"]
+
+
+class BatchUniqueValidationTests(TestCase):
+    def setUp(self):
+        self.post = Post.objects.create(title="Post")
+        self.tags = [
+            self.post.tags.create(name="tag%d" % i, position=i) for i in range(3)
+        ]
+        self.other_post = Post.objects.create(title="Other post")
+        self.other_post.tags.create(name="taken", position=0)
+
+    def get_data(self, new_rows=()):
+        data = {
+            "title": "Post",
+            "formset-tags-INITIAL_FORMS": len(self.tags),
+            "formset-tags-TOTAL_FORMS": len(self.tags) + len(new_rows),
+        }
+        rows = [(tag.pk, tag.name, tag.position) for tag in self.tags]
+        rows.extend((None, name, position) for name, position in new_rows)
+        for i, (pk, name, position) in enumerate(rows):
+            if pk is not None:
+                data["formset-tags-%d-id" % i] = pk
+            data["formset-tags-%d-post" % i] = self.post.pk
+            data["formset-tags-%d-name" % i] = name
+            data["formset-tags-%d-position" % i] = position
+        return data
+
+    def assertSameErrors(self, data):
+        batched = BatchUniquePostForm(data, instance=self.post)
+        unbatched = PostForm(data, instance=self.post)
+        self.assertEqual(batched.is_valid(), unbatched.is_valid())
+        self.assertEqual(
+            batched.formsets["tags"].errors, unbatched.formsets["tags"].errors
+        )
+        self.assertEqual(
+            batched.formsets["tags"].non_form_errors(),
+            unbatched.formsets["tags"].non_form_errors(),
+        )
+        return batched
+
+    def test_valid_rows_need_one_query_per_constraint(self):
+        data = self.get_data([("new1", 3), ("new2", 4)])
+        form = BatchUniquePostForm(data, instance=self.post)
+        form.formsets["tags"].forms
+        # The ``id`` fields of the three existing rows are validated with a
+        # query each. Then one query checks ``name`` and one checks
+        # ``post``/``position`` for all rows.
+        with self.assertNumQueries(5):
+            self.assertTrue(form.is_valid(), form.errors)
+
+    def test_existing_values_are_errors(self):
+        form = self.assertSameErrors(self.get_data([("taken", 3), ("new", 1)]))
+        errors = form.formsets["tags"].errors
+        self.assertIn("name", errors[3])
+        self.assertIn("__all__", errors[4])
+
+    def test_duplicates_within_rows(self):
+        self.assertSameErrors(self.get_data([("dup", 3), ("dup", 4)]))
+
+    def test_unchanged_rows_are_valid(self):
+        form = self.assertSameErrors(self.get_data())
+        self.assertTrue(form.is_valid())
+
+    def test_values_that_differ_in_python_fall_back_for_every_column(self):
+        validation = BatchUniqueValidation(None)
+        # The database matches "1" with the stored integer 1, like a case
+        # insensitive collation matches strings that differ in Python.
+        candidates = [(None, (self.post.pk, "1"))]
+        self.assertIsNone(
+            validation.get_existing(Tag, ("post", "position"), candidates)
+        )
+        candidates = [(None, (self.post.pk, 1))]
+        self.assertEqual(
+            validation.get_existing(Tag, ("post", "position"), candidates),
+            {(self.post.pk, 1): set([self.tags[1].pk])},
+        )
@@ -1,5 +1,28 @@
+from unittest import skipIf
+
+import django
+from django import forms
+from django.core.cache import caches
+from django.forms.formsets import formset_factory
+from django.forms.models import inlineformset_factory
 from django.test import TestCase
-from django_superform.widgets import TemplateWidget
+from django.utils import translation
+from django_superform import widgets
+from django_superform.widgets import FormSetWidget, FormWidget, TemplateWidget
+
+from .models import Post, Series
+
+try:
+    import jinja2
+except ImportError:
+    jinja2 = None
+
+
+class AddressForm(forms.Form):
+    street = forms.CharField()
+
+
+AddressFormSet = formset_factory(AddressForm, extra=1)
 
 
 class TemplateWidgetTests(TestCase):
@@ -58,3 +81,267 @@ class TemplateWidgetTests(TestCase):
                     template_name="_print_name.html",
                 )
                 self.assertEqual(result.strip(), "A_NAME")
+
+
+class TemplateCacheTests(TestCase):
+    def setUp(self):
+        widgets.clear_template_cache()
+
+    def test_template_is_cached(self):
+        template = widgets.get_template("_print_name.html")
+        self.assertIs(widgets.get_template("_print_name.html"), template)
+        self.assertIn((None, "_print_name.html"), widgets._template_cache)
+
+    def test_cached_template_is_rendered(self):
+        widget = TemplateWidget(template_name="_print_name.html")
+        widget.render(name="FIRST", value=None)
+        with self.assertTemplateUsed("_print_name.html"):
+            result = widget.render(name="SECOND", value=None)
+        self.assertEqual(result.strip(), "SECOND")
+
+    def test_no_cache_in_debug_mode(self):
+        with self.settings(DEBUG=True):
+            widgets.get_template("_print_name.html")
+            self.assertEqual(widgets._template_cache, {})
+
+    def test_cache_is_cleared_when_templates_change(self):
+        widgets.get_template("_print_name.html")
+        with self.settings(TEMPLATES=[]):
+            self.assertEqual(widgets._template_cache, {})
+
+
+class RendererTests(TestCase):
+    def test_get_renderer_shares_instances(self):
+        renderer = widgets.get_renderer("django")
+        self.assertIsInstance(renderer, widgets.DjangoTemplatesRenderer)
+        self.assertIs(
+            widgets.get_renderer(widgets.DjangoTemplatesRenderer), renderer)
+        self.assertIs(
+            widgets.get_renderer(
+                "django_superform.widgets.DjangoTemplatesRenderer"),
+            renderer)
+        self.assertIs(widgets.get_renderer(renderer), renderer)
+
+    @skipIf(django.VERSION < (1, 8), "Template backends need Django 1.8+")
+    def test_it_renders_with_given_renderer(self):
+        widget = TemplateWidget(
+            template_name="_print_name.html", renderer="django")
+        self.assertIs(widget.renderer, widgets.get_renderer("django"))
+        result = widget.render(name="A_NAME", value=None)
+        self.assertEqual(result.strip(), "A_NAME")
+
+    def test_it_renders_with_callable(self):
+        calls = []
+
+        def renderer(template_name, context, request):
+            calls.append((template_name, context["name"], request))
+            return "<p>{0}</p>".format(context["name"])
+
+        widget = TemplateWidget(
+            template_name="_print_name.html", renderer=renderer)
+        result = widget.render(name="A_NAME", value=None)
+        self.assertEqual(result, "<p>A_NAME</p>")
+        self.assertEqual(calls, [("_print_name.html", "A_NAME", None)])
+
+    @skipIf(jinja2 is None, "Jinja2 is not installed")
+    @skipIf(django.VERSION < (1, 8), "Template backends need Django 1.8+")
+    def test_jinja2_templates_render_like_django_templates(self):
+        form = AddressForm({"street": "Main <Street>"})
+        django_html = FormWidget().render("address", form)
+        jinja2_html = FormWidget(renderer="jinja2").render("address", form)
+        self.assertIn("Main &lt;Street&gt;", jinja2_html)
+        self.assertNotIn("&lt;input", jinja2_html)
+        self.assertEqual(jinja2_html.strip(), django_html.strip())
+
+
+class PythonRendererTests(TestCase):
+    def assertSameOutput(self, widget_class, value):
+        expected = widget_class().render("name", value)
+        result = widget_class(renderer="python").render("name", value)
+        self.assertEqual(result, expected)
+
+    def test_unbound_form(self):
+        self.assertSameOutput(FormWidget, AddressForm(prefix="address"))
+
+    def test_form_with_errors(self):
+        form = AddressForm({"address-street": ""}, prefix="address")
+        form.is_valid()
+        self.assertSameOutput(FormWidget, form)
+
+    def test_form_escapes_values(self):
+        form = AddressForm({"street": "Main <Street>"})
+        result = FormWidget(renderer="python").render("name", form)
+        self.assertIn("Main &lt;Street&gt;", result)
+        self.assertSameOutput(FormWidget, form)
+
+    def test_unbound_formset(self):
+        formset = AddressFormSet(
+            prefix="addresses", initial=[{"street": "a"}, {"street": "b"}])
+        self.assertSameOutput(FormSetWidget, formset)
+
+    def test_bound_formset_with_errors(self):
+        data = {
+            "addresses-TOTAL_FORMS": "3",
+            "addresses-INITIAL_FORMS": "0",
+            "addresses-0-street": "a",
+            "addresses-1-street": "",
+            "addresses-2-street": "<c>",
+        }
+        formset = AddressFormSet(data, prefix="addresses")
+        formset.is_valid()
+        self.assertSameOutput(FormSetWidget, formset)
+
+    def test_empty_formset(self):
+        formset = formset_factory(AddressForm, extra=0)(prefix="addresses")
+        self.assertSameOutput(FormSetWidget, formset)
+
+    def test_other_templates_use_template_loader(self):
+        widget = TemplateWidget(
+            template_name="_print_name.html", renderer="python")
+        result = widget.render(name="A_NAME", value=None)
+        self.assertEqual(result.strip(), "A_NAME")
+
+
+class StreamTests(TestCase):
+    def get_formset(self):
+        data = {
+            "addresses-TOTAL_FORMS": "3",
+            "addresses-INITIAL_FORMS": "0",
+            "addresses-0-street": "a",
+            "addresses-1-street": "",
+            "addresses-2-street": "<c>",
+        }
+        return AddressFormSet(data, prefix="addresses")
+
+    def test_formset_is_streamed_form_by_form(self):
+        formset = self.get_formset()
+        renderers = [None, "python"]
+        if django.VERSION >= (1, 8):
+            renderers.append("django")
+        for renderer in renderers:
+            widget = FormSetWidget(renderer=renderer)
+            chunks = list(widget.stream("name", formset))
+            self.assertEqual(len(chunks), 5)
+            self.assertEqual("".join(chunks), widget.render("name", formset))
+
+    def test_custom_templates_are_rendered_in_one_chunk(self):
+        widget = FormSetWidget(template_name="_print_name.html")
+        self.assertFalse(widget.can_stream())
+        chunks = list(widget.stream("A_NAME", self.get_formset()))
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].strip(), "A_NAME")
+
+    def test_overridden_templates_are_rendered_in_one_chunk(self):
+        class OverriddenFormSetWidget(FormSetWidget):
+            def get_template(self, template_name, renderer=None):
+                # Stands in for a project template that overrides
+                # superform/formsetfield.html.
+                return widgets.get_template("_print_name.html", renderer=renderer)
+
+        widget = OverriddenFormSetWidget()
+        self.assertTrue(FormSetWidget().can_stream())
+        self.assertFalse(widget.can_stream())
+        chunks = list(widget.stream("A_NAME", self.get_formset()))
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0], widget.render("A_NAME", self.get_formset()))
+
+
+PostFormSet = inlineformset_factory(Series, Post, fields=("title",), extra=1)
+
+
+class SeriesForm(forms.ModelForm):
+    class Meta:
+        model = Series
+        fields = ("title",)
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_unbound_form_is_rendered_once(self):
+        widget = FormWidget(cache_alias="default")
+        html = widget.render("address", AddressForm(prefix="address"))
+        with self.assertTemplateNotUsed("superform/formfield.html"):
+            cached = widget.render("address", AddressForm(prefix="address"))
+        self.assertEqual(cached, html)
+
+    def test_key_depends_on_prefix_and_language(self):
+        widget = FormWidget(cache_alias="default")
+        form = AddressForm(prefix="address")
+        key = widget.get_cache_key(widget.template_name, "address", form)
+        other_prefix = AddressForm(prefix="other")
+        self.assertNotEqual(
+            widget.get_cache_key(widget.template_name, "address", other_prefix),
+            key,
+        )
+        with translation.override("de"):
+            self.assertNotEqual(
+                widget.get_cache_key(widget.template_name, "address", form),
+                key,
+            )
+
+    def test_key_depends_on_initial(self):
+        widget = FormWidget(cache_alias="default")
+        alice = widget.render(
+            "address", AddressForm(prefix="address", initial={"street": "Alice"})
+        )
+        bob = widget.render(
+            "address", AddressForm(prefix="address", initial={"street": "Bob"})
+        )
+        self.assertIn("Alice", alice)
+        self.assertIn("Bob", bob)
+        self.assertNotIn("Alice", bob)
+
+        widget = FormSetWidget(cache_alias="default")
+        alice = widget.render(
+            "a", AddressFormSet(prefix="a", initial=[{"street": "Alice"}])
+        )
+        bob = widget.render(
+            "a", AddressFormSet(prefix="a", initial=[{"street": "Bob"}])
+        )
+        self.assertIn("Alice", alice)
+        self.assertIn("Bob", bob)
+        self.assertNotIn("Alice", bob)
+
+    def test_version_invalidates_entries(self):
+        form = AddressForm(prefix="address")
+        FormWidget(cache_alias="default").render("address", form)
+        widget = FormWidget(cache_alias="default", cache_version=2)
+        with self.assertTemplateUsed("superform/formfield.html"):
+            widget.render("address", form)
+
+    def test_bound_and_instance_forms_are_not_cached(self):
+        widget = FormWidget(cache_alias="default")
+        self.assertTrue(widget.is_cacheable(SeriesForm()))
+        self.assertFalse(widget.is_cacheable(AddressForm({"street": "a"})))
+        series = Series.objects.create(title="Series")
+        self.assertFalse(widget.is_cacheable(SeriesForm(instance=series)))
+
+        form = AddressForm({"street": "a"})
+        widget.render("address", form)
+        with self.assertTemplateUsed("superform/formfield.html"):
+            widget.render("address", form)
+
+    def test_formsets(self):
+        widget = FormSetWidget(cache_alias="default")
+        self.assertTrue(widget.is_cacheable(AddressFormSet(prefix="a")))
+        self.assertTrue(widget.is_cacheable(PostFormSet(instance=Series())))
+        series = Series.objects.create(title="Series")
+        self.assertFalse(widget.is_cacheable(PostFormSet(instance=series)))
+        data = {"a-TOTAL_FORMS": "1", "a-INITIAL_FORMS": "0"}
+        self.assertFalse(
+            widget.is_cacheable(AddressFormSet(data, prefix="a")))
+
+        html = widget.render("a", AddressFormSet(prefix="a"))
+        with self.assertTemplateNotUsed("superform/formsetfield.html"):
+            cached = widget.render("a", AddressFormSet(prefix="a"))
+        self.assertEqual(cached, html)
+        self.assertEqual(
+            "".join(widget.stream("a", AddressFormSet(prefix="a"))), html)
+
+    def test_no_cache_by_default(self):
+        widget = FormWidget()
+        form = AddressForm(prefix="address")
+        self.assertIsNone(
+            widget.get_cache_key(widget.template_name, "address", form))